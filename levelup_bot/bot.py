@@ -2,14 +2,12 @@
 
 import asyncio
 import logging
-import queue
-import threading
 from typing import Optional
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 
-from telethon import TelegramClient, events
+from telethon import TelegramClient, events, utils
+from telethon.errors import RPCError
 from telethon.tl.types import Channel
-from pix2text import Pix2Text
 
 from .config.settings import (
     ENABLE_WORD_SENDING,
@@ -19,19 +17,18 @@ from .config.settings import (
     ENABLE_MATH_CHALLENGES,
     ENABLE_BOX_MESSAGES,
     ENABLE_BONUS_MESSAGES,
+    HANDLER_WORKERS,
     AUTO_DELETE_WORD_MESSAGES,
 )
 from .config.logging_config import setup_logging
-from .telegram.client import initialize_client
+from .telegram.client import initialize_client, close_client
 from .telegram.group import find_or_join_group
-from .telegram.messaging import send_message_to_group
 from .handlers.message_handler import handle_new_message
-from .services.message_worker import message_worker
 from .services.word_sender import word_sender_loop
 from .services.bonus_sender import bonus_message_loop
-from .ocr.model import initialize_ocr_model
-from .ocr.cpu_patch import apply_cpu_patches
-from .utils.wordlist import load_wordlist
+from .services.job_worker import job_worker_loop, discard_pending_jobs
+from .ocr.model import OCRModel, get_ocr_executor, initialize_ocr_model
+from .utils.wordlist import load_wordlist_async
 from .utils.shutdown import setup_signal_handlers
 
 logger = logging.getLogger(__name__)
@@ -42,9 +39,6 @@ class Bot:
     
     def __init__(self):
         """Initialize the bot."""
-        # Apply CPU patches early
-        apply_cpu_patches()
-        
         # Setup logging
         setup_logging()
         self.logger = logging.getLogger(__name__)
@@ -52,25 +46,22 @@ class Bot:
         # Core components
         self.client: Optional[TelegramClient] = None
         self.group_entity: Optional[Channel] = None
-        self.ocr_model: Optional[Pix2Text] = None
-        self.ocr_executor: Optional[ThreadPoolExecutor] = None
+        self.sender_id: Optional[int] = None
+        self.ocr_model: Optional[OCRModel] = None
+        self.ocr_executor: Optional[ProcessPoolExecutor] = None
         
         # State management
-        self.running = asyncio.Event()
-        self.running.set()  # Start as running
-        self.shutdown_event: Optional[asyncio.Event] = None
+        self.shutdown_event = asyncio.Event()
         self.event_loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Services
         self.wordlist: list[str] = []
-        self.message_queue: queue.Queue = queue.Queue()
-        self.worker_thread: Optional[threading.Thread] = None
-        self.worker_running = threading.Event()
-        self.worker_running.set()
         
         # Tasks
         self.bonus_loop_task: Optional[asyncio.Task] = None
         self.word_sender_task: Optional[asyncio.Task] = None
+        self.job_worker_tasks: list[asyncio.Task] = []
+        self.disconnect_task: Optional[asyncio.Task] = None
     
     async def initialize(self) -> bool:
         """Initialize all bot components.
@@ -86,10 +77,11 @@ class Bot:
         # Print configuration summary
         self._print_config_summary()
         
-        # Load wordlist (only if word sending is enabled)
+        # Load wordlist (only if word sending is enabled) while connecting to Telegram
         self.logger.info("📂 Loading wordlist...")
+        self.logger.info("🔌 Connecting to Telegram...")
         if ENABLE_WORD_SENDING:
-            self.wordlist = load_wordlist()
+            self.wordlist, self.client = await asyncio.gather(load_wordlist_async(), initialize_client())
             if not self.wordlist:
                 self.logger.error("❌ Cannot proceed without wordlist when word sending is enabled")
                 return False
@@ -97,10 +89,9 @@ class Bot:
         else:
             self.logger.info("⏭️  Word sending is disabled. Skipping wordlist loading.")
             self.wordlist = []
+            self.client = await initialize_client()
         
-        # Initialize client
-        self.logger.info("🔌 Connecting to Telegram...")
-        self.client = await initialize_client()
+        # Verify client connection
         if not self.client:
             self.logger.error("❌ Failed to initialize client")
             return False
@@ -138,18 +129,34 @@ class Bot:
         print(f"[DEBUG] OCR model available: {self.ocr_model is not None}")
         print(f"[DEBUG] OCR executor available: {self.ocr_executor is not None}")
         
+        # Resolve the sender filter once so Telethon can filter by ID at dispatch time
+        if MESSAGE_SENDER_USERNAME:
+            try:
+                sender_entity = await self.client.get_entity(MESSAGE_SENDER_USERNAME)
+                self.sender_id = sender_entity.id
+                print(f"[DEBUG] Resolved @{MESSAGE_SENDER_USERNAME} to ID {self.sender_id}")
+            except (ValueError, RPCError) as e:
+                self.logger.warning(f"⚠️  Could not resolve @{MESSAGE_SENDER_USERNAME} ({e}), filtering by username instead")
+        
+        # Marked (-100...) group ID, computed once for the filter and the per-message check
+        group_peer_id = utils.get_peer_id(self.group_entity)
+        
         # Create a proper async wrapper function for better debugging
         async def message_handler_wrapper(event):
             """Wrapper function for message handler with debug output."""
             print("[DEBUG] Event handler wrapper called - routing to handle_new_message")
-            await handle_new_message(event, self.client, self.group_entity, self.ocr_model, self.ocr_executor)
+            await handle_new_message(
+                event, self.client, self.group_entity, self.ocr_model, self.ocr_executor, self.sender_id, group_peer_id
+            )
         
         # Register the event handler
         print("[DEBUG] Calling client.add_event_handler...")
         try:
+            # A marked (negative) peer ID goes straight into the filter's ID set,
+            # while an entity or bare positive ID needs resolving/expanding first
             self.client.add_event_handler(
                 message_handler_wrapper,
-                events.NewMessage(chats=self.group_entity)
+                events.NewMessage(chats=group_peer_id, from_users=self.sender_id)
             )
             print("[DEBUG] ✅ Event handler registered successfully")
             self.logger.info(f"✅ Message event handler registered for group: {self.group_entity.title}")
@@ -211,23 +218,21 @@ class Bot:
         self.logger.info(f"   • Target Group: {GROUP_NAME or 'Auto-detect'}")
         self.logger.info("")
     
-    async def start(self):
-        """Start all bot services."""
-        # Start worker thread
-        self.logger.info("🔄 Starting message worker thread...")
-        self.worker_thread = threading.Thread(
-            target=message_worker,
-            args=(self.message_queue, self.client, self.group_entity, self.event_loop, self.worker_running),
-            daemon=True
-        )
-        self.worker_thread.start()
-        self.logger.info("✅ Message worker thread started")
+    def _start_services(self, tg: asyncio.TaskGroup):
+        """Spawn the background service loops in the bot's task group.
+        
+        Args:
+            tg: Task group owned by run(); leaving it cancels and awaits every service
+        """
+        # Start the consumers for math challenge / box jobs queued by the message handler;
+        # several share the queue so a slow OCR job doesn't hold up box clicks behind it
+        self.job_worker_tasks = [tg.create_task(job_worker_loop()) for _ in range(HANDLER_WORKERS)]
         
         # Start bonus message loop as async task (only if enabled)
         if ENABLE_BONUS_MESSAGES:
             self.logger.info(f"💬 Starting bonus message loop (random interval: {BONUS_INTERVAL_MIN}-{BONUS_INTERVAL_MAX}s)...")
-            self.bonus_loop_task = asyncio.create_task(
-                bonus_message_loop(self.client, self.group_entity, self.running)
+            self.bonus_loop_task = tg.create_task(
+                bonus_message_loop(self.client, self.group_entity, self.shutdown_event)
             )
             self.logger.info("✅ Bonus message loop started")
         else:
@@ -236,13 +241,15 @@ class Bot:
         # Start main loop in background (only if word sending is enabled)
         if ENABLE_WORD_SENDING:
             self.logger.info("📝 Starting word sending loop...")
-            self.word_sender_task = asyncio.create_task(
-                word_sender_loop(self.wordlist, self.message_queue, self.running)
+            self.word_sender_task = tg.create_task(
+                word_sender_loop(self.client, self.group_entity, self.wordlist, self.shutdown_event)
             )
             self.logger.info("✅ Word sending loop started")
         else:
             self.logger.info("⏭️  Word sending is disabled. Main loop will not start.")
-        
+    
+    async def start(self):
+        """Announce the active features; run() spawns the service loops."""
         # Print ready message
         self.logger.info("")
         self.logger.info("=" * 60)
@@ -270,17 +277,38 @@ class Bot:
         self.logger.info("=" * 60)
         self.logger.info("")
     
+    async def _run_services(self):
+        """Run the service loops in a TaskGroup until shutdown is requested.
+        
+        Leaving the group cancels and awaits every service, and a service that
+        crashes stops the bot instead of dying silently.
+        """
+        try:
+            async with asyncio.TaskGroup() as tg:
+                self._start_services(tg)
+                # Keep running until interrupted
+                await self.shutdown_event.wait()
+                
+                # Disconnect while the services unwind, instead of after
+                if self.client:
+                    self.logger.info("🔌 Disconnecting Telegram client...")
+                    self.disconnect_task = asyncio.create_task(close_client())
+                self.logger.info("Cancelling running tasks...")
+                for task in (self.bonus_loop_task, self.word_sender_task, *self.job_worker_tasks):
+                    if task:
+                        task.cancel()
+        except* Exception as eg:
+            for error in eg.exceptions:
+                self.logger.error(f"❌ Service failed: {error!r}", exc_info=error)
+    
     async def run(self):
         """Run the bot until shutdown."""
-        # Create shutdown event
-        self.shutdown_event = asyncio.Event()
-        
         # Setup signal handlers
-        setup_signal_handlers(self.shutdown_event, self.event_loop)
+        # A signal sets shutdown_event; a second one cancels this task, which still unwinds into shutdown()
+        setup_signal_handlers(self.shutdown_event, self.event_loop, asyncio.current_task())
         
         try:
-            # Keep running until interrupted
-            await self.shutdown_event.wait()
+            await self._run_services()
         except KeyboardInterrupt:
             self.logger.info("Received interrupt signal, shutting down...")
         except asyncio.CancelledError:
@@ -289,56 +317,31 @@ class Bot:
             await self.shutdown()
     
     async def shutdown(self):
-        """Gracefully shutdown all bot components."""
-        self.running.clear()  # Signal all loops to stop
-        self.worker_running.clear()  # Signal worker thread to stop
-        self.shutdown_event.set()  # Signal shutdown
-        
-        # Cancel all running tasks
-        self.logger.info("Cancelling running tasks...")
-        tasks_to_cancel = []
-        if self.bonus_loop_task:
-            tasks_to_cancel.append(self.bonus_loop_task)
-        if self.word_sender_task:
-            tasks_to_cancel.append(self.word_sender_task)
+        """Gracefully shutdown all bot components.
         
-        for task in tasks_to_cancel:
-            task.cancel()
-        
-        # Wait for tasks to finish cancelling (with timeout)
-        try:
-            await asyncio.wait_for(
-                asyncio.gather(*tasks_to_cancel, return_exceptions=True),
-                timeout=2.0
-            )
-        except asyncio.TimeoutError:
-            self.logger.warning("Tasks did not cancel within timeout")
-        except Exception as e:
-            self.logger.debug(f"Error during task cancellation: {e}")
-        
-        # Signal worker thread to stop
-        self.message_queue.put(None)  # Shutdown signal
-        
-        # Wait for worker thread to finish (with timeout)
-        if self.worker_thread and self.worker_thread.is_alive():
-            self.logger.info("Waiting for worker thread to finish...")
-            self.worker_thread.join(timeout=2.0)
-            if self.worker_thread.is_alive():
-                self.logger.warning("Worker thread did not stop within timeout")
+        The service tasks have already been cancelled and awaited by the
+        task group in _run_services() by the time this runs.
+        """
+        self.shutdown_event.set()  # Signal all loops to stop
+        discard_pending_jobs()
         
         # Shutdown OCR executor
-        if self.ocr_executor:
+        # The math handler may have replaced a dead worker pool since startup
+        ocr_executor = get_ocr_executor() or self.ocr_executor
+        if ocr_executor:
             self.logger.info("🔄 Shutting down OCR executor...")
-            self.ocr_executor.shutdown(wait=False)  # Don't wait, just shutdown
+            ocr_executor.shutdown(wait=False)  # Don't wait, just shutdown
         
         if self.client:
-            self.logger.info("🔌 Disconnecting Telegram client...")
+            if self.disconnect_task is None:
+                self.logger.info("🔌 Disconnecting Telegram client...")
+                self.disconnect_task = asyncio.create_task(close_client())
             try:
-                await asyncio.wait_for(self.client.disconnect(), timeout=2.0)
+                await asyncio.wait_for(self.disconnect_task, timeout=2.0)
                 self.logger.info("✅ Telegram client disconnected")
             except asyncio.TimeoutError:
                 self.logger.warning("⚠️  Client disconnect timed out")
-            except Exception as e:
+            except OSError as e:  # ConnectionError is an OSError
                 self.logger.debug(f"Error disconnecting client: {e}")
         
         self.logger.info("")
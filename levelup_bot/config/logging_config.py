@@ -1,14 +1,18 @@
 """Logging configuration for LevelUp Bot."""
 
 import logging
+import sys
 
 
 def setup_logging():
-    """Configure logging for the application."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    """Configure logging for the application.
+    
+    Per-message lines (each sent word, each clicked button) are logged at
+    DEBUG, so the default INFO level stays quiet in the send loops.
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
     
     # Suppress verbose warnings from RapidOCR and other libraries
     logging.getLogger('RapidOCR').setLevel(logging.ERROR)
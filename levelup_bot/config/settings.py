@@ -10,10 +10,12 @@ load_dotenv()
 API_ID: Final[int] = int(os.getenv("API_ID", "YOUR_API_ID"))
 API_HASH: Final[str] = os.getenv("API_HASH", "YOUR_API_HASH")
 SESSION_NAME: Final[str] = os.getenv("SESSION_NAME", "YOUR_SESSION_NAME")
+SESSION_SYNC_MAX_AGE: Final[int] = 600  # Skip the startup session sync if the last one is newer than this (seconds)
 
 # Group settings
 GROUP_INVITE_URL: Final[str] = os.getenv("GROUP_INVITE_URL", "https://t.me/+6p9Y15Lhw9I4ODFk")
 GROUP_NAME: Final[str] = os.getenv("GROUP_NAME", "کودکسالان سیرک V.2")  # Optional: group name to find from dialogs
+DIALOG_INDEX_TTL: Final[int] = 60  # Reuse the dialog title index for this long across group lookups (seconds)
 
 # Bonus message settings
 BONUS_MESSAGE: Final[str] = os.getenv("BONUS_MESSAGE", "یا زهرا")
@@ -24,6 +26,7 @@ BONUS_INTERVAL: Final[int] = BONUS_INTERVAL_MIN  # Deprecated: use random interv
 
 # Message handler settings
 MESSAGE_SENDER_USERNAME: Final[Optional[str]] = os.getenv("MESSAGE_SENDER_USERNAME", "")  # Optional: only process messages from this username (empty = process all)
+HANDLER_WORKERS: Final[int] = 4  # Concurrent consumers of the challenge/box job queue (OCR itself still runs one at a time)
 
 # Word sender settings
 ENABLE_WORD_SENDING: Final[bool] = os.getenv("ENABLE_WORD_SENDING", "true").lower() in ("true", "1", "yes")  # Enable/disable word sending
@@ -33,7 +36,14 @@ AUTO_DELETE_WORD_MESSAGES: Final[bool] = os.getenv("AUTO_DELETE_WORD_MESSAGES",
 # Feature toggles
 ENABLE_MATH_CHALLENGES: Final[bool] = os.getenv("ENABLE_MATH_CHALLENGES", "true").lower() in ("true", "1", "yes")  # Enable/disable math challenge processing
 ENABLE_BOX_MESSAGES: Final[bool] = os.getenv("ENABLE_BOX_MESSAGES", "true").lower() in ("true", "1", "yes")  # Enable/disable box message processing
+ENABLE_MESSAGE_BATCHING: Final[bool] = os.getenv("ENABLE_MESSAGE_BATCHING", "false").lower() in ("true", "1", "yes")  # Coalesce bursts of group messages into one newline-joined send
 ENABLE_BONUS_MESSAGES: Final[bool] = os.getenv("ENABLE_BONUS_MESSAGES", "true").lower() in ("true", "1", "yes")  # Enable/disable bonus message sending
+CLEAN_EXIT: Final[bool] = os.getenv("CLEAN_EXIT", "false").lower() in ("true", "1", "yes")  # Exit via sys.exit (full interpreter teardown) instead of os._exit, e.g. for debugging
+OCR_MFR_INT8_DIR: Final[str] = os.getenv("OCR_MFR_INT8_DIR", "models/mfr_int8")  # INT8 formula model from quantize_mfr.py (used if the directory exists)
+
+# Message batching settings (only used when ENABLE_MESSAGE_BATCHING is on)
+MESSAGE_BATCH_FLUSH_INTERVAL: Final[float] = 0.3  # Seconds to wait for more messages before flushing a batch
+MESSAGE_BATCH_MAX_CHARS: Final[int] = 4000  # Flush early before reaching Telegram's 4096-char message limit
 
 # Message rate based on WORD_SENDER setting
 # If WORD_SENDER is True: 900-1100 messages/hour (3.27-4.0s delay)
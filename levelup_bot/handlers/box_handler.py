@@ -2,12 +2,119 @@
 
 import logging
 import asyncio
-from telethon import TelegramClient
+from telethon import TelegramClient, errors
 from telethon.tl.types import Message
 from telethon.errors import PersistentTimestampOutdatedError
+from telethon.tl.functions.messages import GetBotCallbackAnswerRequest
+
+from ..telegram.ratelimit import send_bucket
 
 logger = logging.getLogger(__name__)
 
+# Buttons of one box clicked at the same time; each click attempt also takes a send_bucket token
+CLICK_CONCURRENCY = 3
+_click_semaphore = asyncio.Semaphore(CLICK_CONCURRENCY)
+
+
+async def _try_click(client: TelegramClient, make_click, label: str) -> bool:
+    """Run one click attempt, syncing the session and retrying once on a stale timestamp.
+    
+    Args:
+        client: Telegram client instance
+        make_click: Zero-argument callable returning the click coroutine
+        label: Method description for debug output
+    
+    Returns:
+        True if the click went through
+    """
+    try:
+        await send_bucket.acquire()
+        await make_click()
+        print(f"[DEBUG]   ✅ {label} SUCCESS")
+        return True
+    except PersistentTimestampOutdatedError:
+        print(f"[DEBUG]   ⚠️  PersistentTimestampOutdatedError, syncing session...")
+        logger.warning(f"⚠️  PersistentTimestampOutdatedError when clicking button, syncing session...")
+        try:
+            await client.catch_up()
+            logger.info("✅ Session synced, retrying button click...")
+            await send_bucket.acquire()
+            await make_click()
+            print(f"[DEBUG]   ✅ {label} SUCCESS after sync")
+            return True
+        except (errors.RPCError, OSError, asyncio.TimeoutError) as retry_error:
+            print(f"[DEBUG]   ❌ {label} FAILED after sync: {retry_error}")
+            logger.debug(f"Failed to click button ({label}) after sync: {retry_error}")
+    except (errors.RPCError, OSError, asyncio.TimeoutError) as e:
+        if isinstance(e, errors.FloodWaitError):
+            # Slow every other click (and send) down rather than hammering on
+            send_bucket.penalize(e.seconds)
+        print(f"[DEBUG]   ❌ {label} FAILED: {e}")
+        logger.debug(f"Failed to click button ({label}): {e}")
+    return False
+
+
+async def _click_button(
+    client: TelegramClient,
+    message: Message,
+    button,
+    row_index: int,
+    button_index: int
+) -> str:
+    """Click a single inline button, trying each click method in turn.
+    
+    Args:
+        client: Telegram client instance
+        message: Message containing the button
+        button: Inline keyboard button
+        row_index: Row of the button in the keyboard
+        button_index: Position of the button in its row
+    
+    Returns:
+        "clicked", "skipped" (URL button) or "failed"
+    """
+    print(f"[DEBUG] Processing button [{row_index}, {button_index}]")
+    data = getattr(button, 'data', None)
+    nested_data = getattr(getattr(button, 'button', None), 'data', None)
+    
+    # Get the peer from the message for the raw callback request
+    peer = getattr(message, 'peer_id', None) or getattr(message, 'chat_id', None) or getattr(message, 'input_chat', None)
+    
+    methods = []
+    # Method 1: Click by data attribute
+    if data:
+        methods.append(("Method 1 (data)", lambda: message.click(data=data)))
+    # Method 2: Click by index
+    methods.append(("Method 2 (index)", lambda: message.click(row_index, button_index)))
+    # Method 3: Try accessing nested button structure
+    if nested_data:
+        methods.append(("Method 3 (nested data)", lambda: message.click(data=nested_data)))
+    # Method 4: Use client's request method directly
+    if data and peer:
+        methods.append(("Method 4 (callback request)", lambda: client(GetBotCallbackAnswerRequest(
+            peer=peer,
+            msg_id=message.id,
+            data=data
+        ))))
+    
+    async with _click_semaphore:
+        for label, make_click in methods:
+            if await _try_click(client, make_click, label):
+                button_info = f"data: {data[:20]}" if data else f"index: [{row_index}, {button_index}]"
+                print(f"[DEBUG]   ✅ Button [{row_index}, {button_index}] clicked successfully - {button_info}")
+                logger.debug(f"   ✅ Button [{row_index}, {button_index}] clicked successfully - {button_info}")
+                return "clicked"
+    
+    if hasattr(button, 'url'):
+        # URL button, can't click programmatically
+        print(f"[DEBUG]   ⏭️  Button [{row_index}, {button_index}] is URL type, skipping")
+        logger.debug(f"   ⏭️  Button [{row_index}, {button_index}] is URL type, skipping")
+        return "skipped"
+    
+    print(f"[DEBUG]   ❌ Could not click button at [{row_index}, {button_index}]")
+    logger.warning(f"   ❌ Could not click button at [{row_index}, {button_index}]")
+    return "failed"
+
 
 async def process_box_message(client: TelegramClient, message: Message):
     """Process box message: click all inline buttons.
@@ -38,7 +145,7 @@ async def process_box_message(client: TelegramClient, message: Message):
             print("[DEBUG] Attempting to reconnect client...")
             await client.connect()
             print("[DEBUG] ✅ Client reconnected")
-        except Exception as reconnect_error:
+        except (errors.RPCError, OSError) as reconnect_error:
             print(f"[DEBUG] ❌ Failed to reconnect: {reconnect_error}")
             logger.error(f"Failed to reconnect client: {reconnect_error}")
             print("=" * 60)
@@ -73,161 +180,34 @@ async def process_box_message(client: TelegramClient, message: Message):
             total_rows = len(message.reply_markup.rows)
             print(f"[DEBUG] Found {total_rows} row(s) of buttons")
             logger.info(f"   📊 Found {total_rows} row(s) of buttons")
-            row_index = 0
-            for row in message.reply_markup.rows:
+            
+            # Each click is an independent RPC, so fire them all at once
+            positions = []
+            clicks = []
+            for row_index, row in enumerate(message.reply_markup.rows):
                 buttons_in_row = len(row.buttons)
                 print(f"[DEBUG] Row {row_index + 1}: {buttons_in_row} button(s)")
                 logger.info(f"   📋 Row {row_index + 1}: {buttons_in_row} button(s)")
-                button_index = 0
-                for button in row.buttons:
-                    buttons_total += 1
-                    print(f"[DEBUG] Processing button [{row_index}, {button_index}] (button {buttons_total})")
-                    try:
-                        # Try different methods to click the button
-                        clicked = False
-                        
-                        # Method 1: Click by data attribute
-                        if hasattr(button, 'data') and button.data:
-                            print(f"[DEBUG]   Method 1: Trying to click by data: {button.data[:20] if len(button.data) > 20 else button.data}")
-                            try:
-                                await message.click(data=button.data)
-                                clicked = True
-                                print(f"[DEBUG]   ✅ Method 1 SUCCESS: Clicked by data")
-                                # Small delay between clicks to avoid rate limiting
-                                await asyncio.sleep(0.5)
-                            except PersistentTimestampOutdatedError:
-                                print(f"[DEBUG]   ⚠️  PersistentTimestampOutdatedError, syncing session...")
-                                logger.warning(f"⚠️  PersistentTimestampOutdatedError when clicking button, syncing session...")
-                                try:
-                                    await client.catch_up()
-                                    logger.info("✅ Session synced, retrying button click...")
-                                    await message.click(data=button.data)
-                                    clicked = True
-                                    print(f"[DEBUG]   ✅ Method 1 SUCCESS after sync: Clicked by data")
-                                    await asyncio.sleep(0.5)
-                                except Exception as retry_error:
-                                    print(f"[DEBUG]   ❌ Method 1 FAILED after sync: {retry_error}")
-                                    logger.debug(f"Failed to click button by data after sync: {retry_error}")
-                                    pass
-                            except Exception as e:
-                                print(f"[DEBUG]   ❌ Method 1 FAILED: {e}")
-                                logger.debug(f"Failed to click button by data: {e}")
-                                pass
-                        
-                        # Method 2: Click by index (if data method didn't work)
-                        if not clicked:
-                            print(f"[DEBUG]   Method 2: Trying to click by index [{row_index}, {button_index}]")
-                            try:
-                                await message.click(row_index, button_index)
-                                clicked = True
-                                print(f"[DEBUG]   ✅ Method 2 SUCCESS: Clicked by index")
-                                # Small delay between clicks to avoid rate limiting
-                                await asyncio.sleep(0.5)
-                            except PersistentTimestampOutdatedError:
-                                print(f"[DEBUG]   ⚠️  PersistentTimestampOutdatedError, syncing session...")
-                                logger.warning(f"⚠️  PersistentTimestampOutdatedError when clicking button, syncing session...")
-                                try:
-                                    await client.catch_up()
-                                    logger.info("✅ Session synced, retrying button click...")
-                                    await message.click(row_index, button_index)
-                                    clicked = True
-                                    print(f"[DEBUG]   ✅ Method 2 SUCCESS after sync: Clicked by index")
-                                    await asyncio.sleep(0.5)
-                                except Exception as retry_error:
-                                    print(f"[DEBUG]   ❌ Method 2 FAILED after sync: {retry_error}")
-                                    logger.debug(f"Failed to click button by index after sync: {retry_error}")
-                                    pass
-                            except Exception as e:
-                                print(f"[DEBUG]   ❌ Method 2 FAILED: {e}")
-                                logger.debug(f"Failed to click button by index: {e}")
-                                pass
-                        
-                        # Method 3: Try accessing nested button structure
-                        if not clicked and hasattr(button, 'button') and hasattr(button.button, 'data') and button.button.data:
-                            try:
-                                await message.click(data=button.button.data)
-                                clicked = True
-                                # Small delay between clicks to avoid rate limiting
-                                await asyncio.sleep(0.5)
-                            except PersistentTimestampOutdatedError:
-                                logger.warning(f"⚠️  PersistentTimestampOutdatedError when clicking button, syncing session...")
-                                try:
-                                    await client.catch_up()
-                                    logger.info("✅ Session synced, retrying button click...")
-                                    await message.click(data=button.button.data)
-                                    clicked = True
-                                    await asyncio.sleep(0.5)
-                                except Exception as retry_error:
-                                    logger.debug(f"Failed to click nested button after sync: {retry_error}")
-                                    pass
-                            except Exception as e:
-                                logger.debug(f"Failed to click nested button: {e}")
-                                pass
-                        
-                        # Method 4: Use client's request method directly
-                        if not clicked and hasattr(button, 'data') and button.data:
-                            try:
-                                from telethon.tl.functions.messages import GetBotCallbackAnswerRequest
-                                # Get the peer from the message
-                                peer = getattr(message, 'peer_id', None)
-                                if not peer:
-                                    # Try to get from chat_id
-                                    peer = getattr(message, 'chat_id', None)
-                                if not peer:
-                                    # Try to get from input_chat
-                                    peer = getattr(message, 'input_chat', None)
-                                
-                                if peer:
-                                    result = await client(GetBotCallbackAnswerRequest(
-                                        peer=peer,
-                                        msg_id=message.id,
-                                        data=button.data
-                                    ))
-                                    clicked = True
-                                    await asyncio.sleep(0.5)
-                            except PersistentTimestampOutdatedError:
-                                logger.warning(f"⚠️  PersistentTimestampOutdatedError when clicking button, syncing session...")
-                                try:
-                                    await client.catch_up()
-                                    logger.info("✅ Session synced, retrying button click...")
-                                    if peer:
-                                        result = await client(GetBotCallbackAnswerRequest(
-                                            peer=peer,
-                                            msg_id=message.id,
-                                            data=button.data
-                                        ))
-                                        clicked = True
-                                        await asyncio.sleep(0.5)
-                                except Exception as retry_error:
-                                    logger.debug(f"Failed to click button via client request after sync: {retry_error}")
-                                    pass
-                            except Exception as e:
-                                logger.debug(f"Failed to click button via client request: {e}")
-                                pass
-                        
-                        if clicked:
-                            buttons_clicked += 1
-                            button_info = ""
-                            if hasattr(button, 'data') and button.data:
-                                button_info = f"data: {button.data[:20] if len(button.data) > 20 else button.data}"
-                            else:
-                                button_info = f"index: [{row_index}, {button_index}]"
-                            print(f"[DEBUG]   ✅ Button [{row_index}, {button_index}] clicked successfully - {button_info}")
-                            logger.info(f"   ✅ Button [{row_index}, {button_index}] clicked successfully - {button_info}")
-                        elif hasattr(button, 'url'):
-                            # URL button, can't click programmatically
-                            buttons_skipped += 1
-                            print(f"[DEBUG]   ⏭️  Button [{row_index}, {button_index}] is URL type, skipping")
-                            logger.info(f"   ⏭️  Button [{row_index}, {button_index}] is URL type, skipping")
-                        else:
-                            buttons_failed += 1
-                            print(f"[DEBUG]   ❌ Could not click button at [{row_index}, {button_index}]")
-                            logger.warning(f"   ❌ Could not click button at [{row_index}, {button_index}]")
-                        
-                        button_index += 1
-                    except Exception as e:
-                        logger.error(f"Error clicking button at [{row_index}, {button_index}]: {e}")
-                row_index += 1
+                for button_index, button in enumerate(row.buttons):
+                    positions.append((row_index, button_index))
+                    clicks.append(_click_button(client, message, button, row_index, button_index))
+            
+            buttons_total = len(clicks)
+            print(f"[DEBUG] Clicking {buttons_total} button(s) concurrently...")
+            results = await asyncio.gather(*clicks, return_exceptions=True)
+            
+            for (row_index, button_index), result in zip(positions, results):
+                if isinstance(result, BaseException):
+                    if not isinstance(result, (errors.RPCError, OSError, asyncio.TimeoutError)):
+                        raise result
+                    buttons_failed += 1
+                    logger.error(f"Error clicking button at [{row_index}, {button_index}]: {result}")
+                elif result == "clicked":
+                    buttons_clicked += 1
+                elif result == "skipped":
+                    buttons_skipped += 1
+                else:
+                    buttons_failed += 1
         else:
             logger.warning("   ⚠️  Message has reply_markup but no 'rows' attribute")
         
@@ -258,13 +238,10 @@ async def process_box_message(client: TelegramClient, message: Message):
         print("=" * 60 + "\n")
         logger.info("=" * 60)
         
-    except Exception as e:
+    except (errors.RPCError, OSError) as e:
         print(f"[DEBUG] ❌ ERROR processing box message: {e}")
         print("=" * 60)
         logger.error("=" * 60)
-        logger.error(f"❌ ERROR processing box message: {e}")
+        logger.error(f"❌ ERROR processing box message: {e}", exc_info=True)
         logger.error("=" * 60)
-        import traceback
-        print(f"[DEBUG] Traceback:\n{traceback.format_exc()}")
-        logger.error(traceback.format_exc())
 
@@ -1,26 +1,79 @@
 """Math challenge processing handler."""
 
 import asyncio
-import os
-import tempfile
+import hashlib
+import io
 import logging
+from collections import OrderedDict
 from typing import Optional
-from telethon import TelegramClient
+from telethon import TelegramClient, errors
 from telethon.tl.types import Message
 from telethon.errors import PersistentTimestampOutdatedError
-from pix2text import Pix2Text
-from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from ..ocr.math_solver import parse_and_solve_math
+from ..ocr.model import OCRModel, get_ocr_executor, restart_ocr_executor
 
 logger = logging.getLogger(__name__)
 
+# One OCR at a time, so a burst of challenges can't crowd the executor and event loop
+_ocr_semaphore = asyncio.Semaphore(1)
+
+# Extracted text keyed by BLAKE2b-128 of the image bytes, least recently used first
+OCR_CACHE_SIZE = 256
+_ocr_cache: "OrderedDict[bytes, str]" = OrderedDict()
+
+
+def _extract_text(result) -> str:
+    """Pull the recognized text out of a pix2text result.
+    
+    Args:
+        result: Value returned by ``recognize`` (string, dict, list or result object)
+    
+    Returns:
+        Extracted text (not yet stripped)
+    """
+    # pix2text returns a string or a structured result
+    extracted_text = ""
+    if isinstance(result, str):
+        extracted_text = result
+    elif isinstance(result, dict):
+        # If result is a dict, try common keys
+        extracted_text = result.get('text', result.get('out_text', result.get('formula', result.get('latex', ''))))
+    elif isinstance(result, list):
+        # If result is a list, try to extract text from each item
+        text_parts = []
+        for item in result:
+            if isinstance(item, str):
+                text_parts.append(item)
+            elif isinstance(item, dict):
+                text_parts.append(item.get('text', item.get('out_text', item.get('formula', item.get('latex', '')))))
+            elif hasattr(item, 'text'):
+                text_parts.append(item.text)
+            else:
+                text_parts.append(str(item))
+        extracted_text = ' '.join(text_parts)
+    elif hasattr(result, 'text'):
+        extracted_text = result.text
+    elif hasattr(result, 'out_text'):
+        extracted_text = result.out_text
+    elif hasattr(result, 'formula'):
+        extracted_text = result.formula
+    elif hasattr(result, 'latex'):
+        extracted_text = result.latex
+    else:
+        # Try to convert to string
+        extracted_text = str(result)
+    return extracted_text
+
 
 async def process_math_challenge(
     client: TelegramClient,
     message: Message,
-    ocr_model: Optional[Pix2Text],
-    ocr_executor: Optional[ThreadPoolExecutor]
+    ocr_model: Optional[OCRModel],
+    ocr_executor: Optional[ProcessPoolExecutor]
 ):
     """Process math challenge message: download image, OCR, solve, and reply.
     
@@ -28,7 +81,7 @@ async def process_math_challenge(
         client: Telegram client instance
         message: Message containing the challenge image
         ocr_model: Initialized OCR model
-        ocr_executor: Thread pool executor for OCR operations
+        ocr_executor: Worker process executor for OCR operations
     """
     print("\n" + "=" * 60)
     print("[DEBUG] MATH CHALLENGE HANDLER CALLED - PROCESSING MATH CHALLENGE")
@@ -54,7 +107,7 @@ async def process_math_challenge(
             print("[DEBUG] Attempting to reconnect client...")
             await client.connect()
             print("[DEBUG] ✅ Client reconnected")
-        except Exception as reconnect_error:
+        except (errors.RPCError, OSError) as reconnect_error:
             print(f"[DEBUG] ❌ Failed to reconnect: {reconnect_error}")
             logger.error(f"Failed to reconnect client: {reconnect_error}")
             print("=" * 60)
@@ -83,50 +136,46 @@ async def process_math_challenge(
             print("=" * 60)
             return
         
-        # Download the image (async, won't block)
+        # Download the image into memory (async, won't block)
         print("[DEBUG] Downloading image from message...")
         logger.info("   ⬇️  Downloading image from message...")
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
-        temp_file.close()
-        print(f"[DEBUG] Temporary file created: {temp_file.name}")
+        try:
+            print("[DEBUG] Attempting to download media...")
+            data = await client.download_media(message, file=bytes)
+            print("[DEBUG] ✅ Media downloaded successfully")
+        except PersistentTimestampOutdatedError:
+            print("[DEBUG] ⚠️  PersistentTimestampOutdatedError when downloading, syncing session...")
+            logger.warning("   ⚠️  PersistentTimestampOutdatedError when downloading, syncing session...")
+            await client.catch_up()
+            logger.info("   ✅ Session synced, retrying download...")
+            print("[DEBUG] Retrying download after sync...")
+            data = await client.download_media(message, file=bytes)
+            print("[DEBUG] ✅ Media downloaded successfully after sync")
         
+        file_size = len(data) if data else 0
+        print(f"[DEBUG] Image size: {file_size / 1024:.2f} KB")
+        logger.info(f"   ✅ Image downloaded successfully")
+        logger.info(f"      Size: {file_size / 1024:.2f} KB")
+        
+        # Header-only check (Image.open is lazy); the OCR worker does the full decode
         try:
-            try:
-                print("[DEBUG] Attempting to download media...")
-                await client.download_media(message, temp_file.name)
-                print("[DEBUG] ✅ Media downloaded successfully")
-            except PersistentTimestampOutdatedError:
-                print("[DEBUG] ⚠️  PersistentTimestampOutdatedError when downloading, syncing session...")
-                logger.warning("   ⚠️  PersistentTimestampOutdatedError when downloading, syncing session...")
-                await client.catch_up()
-                logger.info("   ✅ Session synced, retrying download...")
-                print("[DEBUG] Retrying download after sync...")
-                await client.download_media(message, temp_file.name)
-                print("[DEBUG] ✅ Media downloaded successfully after sync")
-            
-            file_size = os.path.getsize(temp_file.name) if os.path.exists(temp_file.name) else 0
-            print(f"[DEBUG] Image file size: {file_size / 1024:.2f} KB")
-            logger.info(f"   ✅ Image downloaded successfully")
-            logger.info(f"      File: {temp_file.name}")
-            logger.info(f"      Size: {file_size / 1024:.2f} KB")
-            
-            # Validate image file before processing
-            try:
-                from PIL import Image
-                # Verify it's a valid image (verify() consumes the file, so we need to reopen)
-                with Image.open(temp_file.name) as img:
-                    img.verify()
-                # Reopen for actual use (verify() closes the file)
-                with Image.open(temp_file.name) as img:
-                    img.load()  # Load the image to ensure it's readable
-                print("[DEBUG] ✅ Image file is valid")
-            except Exception as img_error:
-                print(f"[DEBUG] ❌ Invalid or corrupted image file: {img_error}")
-                logger.error(f"   ❌ Invalid or corrupted image file: {img_error}")
-                logger.info("=" * 60)
-                print("=" * 60)
-                return
-            
+            with Image.open(io.BytesIO(data)) as image:
+                print(f"[DEBUG] ✅ Image is valid ({image.format}, {image.size[0]}x{image.size[1]})")
+        except (OSError, ValueError) as img_error:  # UnidentifiedImageError is an OSError
+            print(f"[DEBUG] ❌ Invalid or corrupted image: {img_error}")
+            logger.error(f"   ❌ Invalid or corrupted image: {img_error}")
+            logger.info("=" * 60)
+            print("=" * 60)
+            return
+        
+        # Identical images (challenge bots recycle a pool) skip OCR entirely
+        cache_key = hashlib.blake2b(data, digest_size=16).digest()
+        extracted_text = _ocr_cache.get(cache_key)
+        if extracted_text is not None:
+            _ocr_cache.move_to_end(cache_key)
+            print("[DEBUG] ✅ OCR cache hit, skipping OCR")
+            logger.info("   ⚡ Image seen before, reusing OCR result")
+        else:
             # Use OCR to extract text
             if not ocr_model or not ocr_executor:
                 print("[DEBUG] ❌ OCR model or executor not initialized")
@@ -139,120 +188,88 @@ async def process_math_challenge(
             logger.info("   🔍 Extracting text from image using OCR...")
             logger.info("      (This may take a few seconds)")
             
-            # Run blocking OCR operation in thread pool to avoid blocking event loop
+            # Run blocking OCR operation in the worker process to avoid blocking event loop
             # This allows word sending and other operations to continue
-            loop = asyncio.get_event_loop()
-            print("[DEBUG] Running OCR in thread pool executor...")
-            result = await loop.run_in_executor(
-                ocr_executor,
-                ocr_model.recognize,
-                temp_file.name
-            )
+            loop = asyncio.get_running_loop()
+            print("[DEBUG] Running OCR in worker process...")
+            async with _ocr_semaphore:
+                # Use the replacement pool if an earlier challenge found the worker dead
+                ocr_executor = get_ocr_executor() or ocr_executor
+                try:
+                    result = await loop.run_in_executor(
+                        ocr_executor,
+                        ocr_model.recognize,
+                        data  # Encoded bytes are much smaller to pickle than decoded pixels
+                    )
+                except BrokenProcessPool as e:
+                    print(f"[DEBUG] ❌ OCR worker process died: {e}")
+                    logger.error(f"   ❌ OCR worker process died: {e}")
+                    # Start a fresh worker so later challenges don't hit the same broken pool
+                    await restart_ocr_executor(ocr_executor)
+                    logger.info("=" * 60)
+                    print("=" * 60)
+                    return
             
             print(f"[DEBUG] OCR result type: {type(result)}")
             print(f"[DEBUG] OCR result: {result}")
             logger.info("   ✅ OCR processing completed")
             
-            # Extract text from result
-            # pix2text returns a string or a structured result
-            extracted_text = ""
-            if isinstance(result, str):
-                extracted_text = result
-            elif isinstance(result, dict):
-                # If result is a dict, try common keys
-                extracted_text = result.get('text', result.get('out_text', result.get('formula', result.get('latex', ''))))
-            elif isinstance(result, list):
-                # If result is a list, try to extract text from each item
-                text_parts = []
-                for item in result:
-                    if isinstance(item, str):
-                        text_parts.append(item)
-                    elif isinstance(item, dict):
-                        text_parts.append(item.get('text', item.get('out_text', item.get('formula', item.get('latex', '')))))
-                    elif hasattr(item, 'text'):
-                        text_parts.append(item.text)
-                    else:
-                        text_parts.append(str(item))
-                extracted_text = ' '.join(text_parts)
-            elif hasattr(result, 'text'):
-                extracted_text = result.text
-            elif hasattr(result, 'out_text'):
-                extracted_text = result.out_text
-            elif hasattr(result, 'formula'):
-                extracted_text = result.formula
-            elif hasattr(result, 'latex'):
-                extracted_text = result.latex
-            else:
-                # Try to convert to string
-                extracted_text = str(result)
-            
-            # Clean up extracted text
-            extracted_text = extracted_text.strip()
-            print(f"[DEBUG] Extracted text (cleaned): '{extracted_text}'")
-            logger.info(f"   📝 Extracted text: '{extracted_text}'")
-            
-            if not extracted_text:
-                print("[DEBUG] ❌ No text extracted from image")
-                logger.warning("   ❌ No text extracted from image")
-                logger.info("=" * 60)
-                print("=" * 60)
-                return
-            
-            # Parse and solve math problem (fast, synchronous is fine)
-            print("[DEBUG] Parsing and solving math expression...")
-            logger.info("   🧮 Parsing and solving math expression...")
-            answer = parse_and_solve_math(extracted_text)
-            print(f"[DEBUG] Math solver result: {answer}")
-            
-            if answer is not None:
-                # Reply with the answer (async, won't block)
-                reply_text = str(int(answer) if answer.is_integer() else answer)
-                print(f"[DEBUG] ✅ Solution found: {extracted_text} = {reply_text}")
-                logger.info(f"   ✅ Solution found: {extracted_text} = {reply_text}")
-                print("[DEBUG] Sending reply...")
-                logger.info(f"   📤 Sending reply...")
-                try:
-                    await message.reply(reply_text)
-                    print(f"[DEBUG] ✅ Reply sent successfully: {reply_text}")
-                except PersistentTimestampOutdatedError:
-                    print("[DEBUG] ⚠️  PersistentTimestampOutdatedError when replying, syncing session...")
-                    logger.warning("   ⚠️  PersistentTimestampOutdatedError when replying, syncing session...")
-                    await client.catch_up()
-                    logger.info("   ✅ Session synced, retrying reply...")
-                    print("[DEBUG] Retrying reply after sync...")
-                    await message.reply(reply_text)
-                    print(f"[DEBUG] ✅ Reply sent successfully after sync: {reply_text}")
-                logger.info(f"   ✅ Successfully replied with answer: {reply_text}")
-                logger.info("=" * 60)
-                print("[DEBUG] MATH CHALLENGE HANDLER COMPLETED SUCCESSFULLY")
-                print("=" * 60 + "\n")
-            else:
-                print(f"[DEBUG] ❌ Could not parse or solve math problem")
-                print(f"[DEBUG]   Extracted text: '{extracted_text}'")
-                logger.warning(f"   ❌ Could not parse or solve math problem")
-                logger.warning(f"      Extracted text: '{extracted_text}'")
-                logger.info("=" * 60)
-                print("=" * 60 + "\n")
-                
-        finally:
-            # Clean up temp file
+            # Extract text from result and clean it up
+            extracted_text = _extract_text(result).strip()
+            _ocr_cache[cache_key] = extracted_text
+            if len(_ocr_cache) > OCR_CACHE_SIZE:
+                _ocr_cache.popitem(last=False)
+        
+        print(f"[DEBUG] Extracted text (cleaned): '{extracted_text}'")
+        logger.info(f"   📝 Extracted text: '{extracted_text}'")
+        
+        if not extracted_text:
+            print("[DEBUG] ❌ No text extracted from image")
+            logger.warning("   ❌ No text extracted from image")
+            logger.info("=" * 60)
+            print("=" * 60)
+            return
+        
+        # Parse and solve math problem (fast, synchronous is fine)
+        print("[DEBUG] Parsing and solving math expression...")
+        logger.info("   🧮 Parsing and solving math expression...")
+        answer = parse_and_solve_math(extracted_text)
+        print(f"[DEBUG] Math solver result: {answer}")
+        
+        if answer is not None:
+            # Reply with the answer (async, won't block)
+            reply_text = str(int(answer) if isinstance(answer, float) and answer.is_integer() else answer)
+            print(f"[DEBUG] ✅ Solution found: {extracted_text} = {reply_text}")
+            logger.info(f"   ✅ Solution found: {extracted_text} = {reply_text}")
+            print("[DEBUG] Sending reply...")
+            logger.info(f"   📤 Sending reply...")
             try:
-                if os.path.exists(temp_file.name):
-                    print(f"[DEBUG] Deleting temporary file: {temp_file.name}")
-                    os.unlink(temp_file.name)
-                    print(f"[DEBUG] ✅ Temporary file deleted")
-                    logger.debug(f"   🗑️  Temporary file deleted: {temp_file.name}")
-            except Exception as cleanup_error:
-                print(f"[DEBUG] ⚠️  Failed to delete temp file: {cleanup_error}")
-                logger.warning(f"   ⚠️  Failed to delete temp file: {cleanup_error}")
-                
-    except Exception as e:
+                await message.reply(reply_text)
+                print(f"[DEBUG] ✅ Reply sent successfully: {reply_text}")
+            except PersistentTimestampOutdatedError:
+                print("[DEBUG] ⚠️  PersistentTimestampOutdatedError when replying, syncing session...")
+                logger.warning("   ⚠️  PersistentTimestampOutdatedError when replying, syncing session...")
+                await client.catch_up()
+                logger.info("   ✅ Session synced, retrying reply...")
+                print("[DEBUG] Retrying reply after sync...")
+                await message.reply(reply_text)
+                print(f"[DEBUG] ✅ Reply sent successfully after sync: {reply_text}")
+            logger.info(f"   ✅ Successfully replied with answer: {reply_text}")
+            logger.info("=" * 60)
+            print("[DEBUG] MATH CHALLENGE HANDLER COMPLETED SUCCESSFULLY")
+            print("=" * 60 + "\n")
+        else:
+            print(f"[DEBUG] ❌ Could not parse or solve math problem")
+            print(f"[DEBUG]   Extracted text: '{extracted_text}'")
+            logger.warning(f"   ❌ Could not parse or solve math problem")
+            logger.warning(f"      Extracted text: '{extracted_text}'")
+            logger.info("=" * 60)
+            print("=" * 60 + "\n")
+            
+    except (errors.RPCError, OSError, asyncio.TimeoutError) as e:
         print(f"[DEBUG] ❌ ERROR processing math challenge: {e}")
         print("=" * 60)
         logger.error("=" * 60)
-        logger.error(f"❌ ERROR processing math challenge: {e}")
+        logger.error(f"❌ ERROR processing math challenge: {e}", exc_info=True)
         logger.error("=" * 60)
-        import traceback
-        print(f"[DEBUG] Traceback:\n{traceback.format_exc()}")
-        logger.error(traceback.format_exc())
 
@@ -1,25 +1,35 @@
 """Main message event handler and router."""
 
-import asyncio
 import logging
-from telethon import TelegramClient, events
+import re
+from typing import Optional
+from telethon import TelegramClient, errors, events, utils
 from telethon.tl.types import Channel, Message
 
 from ..config.settings import MESSAGE_SENDER_USERNAME, ENABLE_MATH_CHALLENGES, ENABLE_BOX_MESSAGES
 from ..handlers.math_challenge import process_math_challenge
 from ..handlers.box_handler import process_box_message
-from pix2text import Pix2Text
-from concurrent.futures import ThreadPoolExecutor
+from ..services.job_worker import enqueue_job
+from ..ocr.model import OCRModel
+from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Both trigger keywords found in one scan: "چالش" (challenge) and "جعبه" (box)
+_KEYWORD_RE = re.compile(r'(?P<challenge>چالش)|(?P<box>جعبه)')
+
+# ID of MESSAGE_SENDER_USERNAME learned from its first message when it couldn't be resolved at startup
+_learned_sender_id: Optional[int] = None
+
 
 async def handle_new_message(
     event: events.NewMessage.Event,
     client: TelegramClient,
     group_entity: Channel,
-    ocr_model: Pix2Text | None,
-    ocr_executor: ThreadPoolExecutor | None
+    ocr_model: OCRModel | None,
+    ocr_executor: ProcessPoolExecutor | None,
+    sender_id: Optional[int] = None,
+    group_peer_id: Optional[int] = None
 ):
     """Handle new messages from the bot.
     
@@ -28,7 +38,11 @@ async def handle_new_message(
         client: Telegram client instance
         group_entity: Target group entity
         ocr_model: OCR model for math challenges
-        ocr_executor: Thread pool executor for OCR
+        ocr_executor: Worker process executor for OCR
+        sender_id: Resolved ID of MESSAGE_SENDER_USERNAME; when given, the sender
+            is checked from the update itself without fetching the sender entity
+        group_peer_id: Marked peer ID of group_entity, precomputed by the caller so
+            it isn't derived again for every message
     """
     print("\n" + "=" * 60)
     print("[DEBUG] MESSAGE HANDLER CALLED - EVENT RECEIVED!")
@@ -54,7 +68,7 @@ async def handle_new_message(
                     await client.connect()
                     print("[DEBUG] ✅ Client reconnected")
                     logger.info("Client reconnected successfully")
-            except Exception as reconnect_error:
+            except (errors.RPCError, OSError) as reconnect_error:
                 print(f"[DEBUG] ❌ Failed to reconnect: {reconnect_error}")
                 logger.error(f"Failed to reconnect client: {reconnect_error}")
                 print("=" * 60)
@@ -65,69 +79,51 @@ async def handle_new_message(
         print(f"[DEBUG] Message ID: {event.message.id}")
         print(f"[DEBUG] Group entity: {group_entity.title if group_entity else None} (ID: {group_entity.id if group_entity else None})")
         
-        # Normalize chat IDs for comparison (Telegram supergroups use negative IDs with -100 prefix)
-        def normalize_chat_id(chat_id):
-            """Normalize Telegram chat ID for comparison.
-            
-            Telegram supergroups have negative IDs like -1003174315970.
-            The actual ID is embedded: abs(-1003174315970) - 1000000000000 = 3174315970
-            """
-            if chat_id is None:
-                return None
-            chat_id = int(chat_id)
-            # If it's a supergroup ID (negative and large), extract the actual ID
-            if chat_id < 0 and abs(chat_id) > 1000000000000:
-                # Remove the -100 prefix: -1003174315970 -> 3174315970
-                normalized = abs(chat_id) - 1000000000000
-                return normalized
-            return abs(chat_id)
-        
-        normalized_event_chat_id = normalize_chat_id(event.chat_id)
-        normalized_group_id = normalize_chat_id(group_entity.id if group_entity else None)
-        
-        print(f"[DEBUG] Normalized event chat_id: {normalized_event_chat_id}")
-        print(f"[DEBUG] Normalized group ID: {normalized_group_id}")
-        
-        # Check if message is from the target group
-        if not group_entity or normalized_event_chat_id != normalized_group_id:
+        # Compare against the marked peer ID (-100... for supergroups) carried by the update
+        if group_peer_id is None and group_entity:
+            group_peer_id = utils.get_peer_id(group_entity)
+        if not group_entity or event.chat_id != group_peer_id:
             print(f"[DEBUG] ❌ Message NOT from target group")
-            print(f"[DEBUG]   Event chat_id (raw): {event.chat_id} (normalized: {normalized_event_chat_id})")
-            print(f"[DEBUG]   Group ID (raw): {group_entity.id if group_entity else None} (normalized: {normalized_group_id})")
-            logger.debug(f"Message not from target group. Chat ID: {event.chat_id} (normalized: {normalized_event_chat_id}), Group ID: {group_entity.id if group_entity else None} (normalized: {normalized_group_id})")
+            print(f"[DEBUG]   Event chat_id: {event.chat_id}, group peer ID: {group_peer_id}")
+            logger.debug(f"Message not from target group. Chat ID: {event.chat_id}, Group peer ID: {group_peer_id}")
             print("=" * 60)
             return
         
-        print(f"[DEBUG] ✅ Message IS from target group (IDs match after normalization)")
+        print(f"[DEBUG] ✅ Message IS from target group")
         logger.info(f"📨 New message received (Message ID: {event.message.id})")
         
-        # Get sender information
-        print("[DEBUG] Getting sender information...")
-        sender = await event.get_sender()
-        sender_username = None
-        sender_id = None
-        if sender:
-            sender_username = getattr(sender, 'username', None)
-            sender_id = getattr(sender, 'id', None)
-            print(f"[DEBUG] Sender: @{sender_username or 'N/A'} (ID: {sender_id or 'N/A'})")
-            logger.info(f"   👤 Sender: @{sender_username or 'N/A'} (ID: {sender_id or 'N/A'})")
-        else:
-            print("[DEBUG] ⚠️  Message has no sender information")
-            logger.warning("   ⚠️  Message has no sender information")
-        
-        # Check if we should filter by sender username
+        # Check if we should filter by sender
         print(f"[DEBUG] MESSAGE_SENDER_USERNAME filter: {MESSAGE_SENDER_USERNAME or '(none - accept all)'}")
-        if MESSAGE_SENDER_USERNAME:
-            # Only process messages from the specified username
+        global _learned_sender_id
+        if sender_id is None and MESSAGE_SENDER_USERNAME:
+            sender_id = _learned_sender_id
+        if sender_id is not None:
+            # Sender ID comes with the update, so no entity lookup is needed
+            if event.sender_id != sender_id:
+                print(f"[DEBUG] ❌ Skipping: Message not from required sender (@{MESSAGE_SENDER_USERNAME})")
+                logger.info(f"   ⏭️  Skipping: Message not from required sender (@{MESSAGE_SENDER_USERNAME})")
+                print("=" * 60)
+                return
+            print(f"[DEBUG] ✅ Message from required sender: @{MESSAGE_SENDER_USERNAME} (ID: {sender_id})")
+            logger.info(f"   ✅ Message from required sender: @{MESSAGE_SENDER_USERNAME}")
+        elif MESSAGE_SENDER_USERNAME:
+            # Sender not resolved yet, compare usernames once and remember the ID it maps to
+            print("[DEBUG] Getting sender information...")
+            sender = await event.get_sender()
+            sender_username = getattr(sender, 'username', None) if sender else None
+            print(f"[DEBUG] Sender: @{sender_username or 'N/A'} (ID: {event.sender_id or 'N/A'})")
+            logger.info(f"   👤 Sender: @{sender_username or 'N/A'} (ID: {event.sender_id or 'N/A'})")
             if not sender_username or sender_username != MESSAGE_SENDER_USERNAME:
                 print(f"[DEBUG] ❌ Skipping: Message not from required sender (@{MESSAGE_SENDER_USERNAME})")
                 print(f"[DEBUG]   Actual sender: @{sender_username or 'N/A'}")
                 logger.info(f"   ⏭️  Skipping: Message not from required sender (@{MESSAGE_SENDER_USERNAME})")
                 print("=" * 60)
                 return
+            _learned_sender_id = event.sender_id
             print(f"[DEBUG] ✅ Message from required sender: @{sender_username}")
             logger.info(f"   ✅ Message from required sender: @{sender_username}")
         else:
-            print("[DEBUG] ✅ No sender filter - accepting message")
+            print(f"[DEBUG] ✅ No sender filter - accepting message (sender ID: {event.sender_id or 'N/A'})")
         
         # Get message text (check both message text and caption for media messages)
         print("[DEBUG] Extracting message text...")
@@ -146,10 +142,12 @@ async def handle_new_message(
         logger.info(f"   🖼️  Has photo/document: {has_photo}")
         logger.info(f"   🔘 Has inline buttons: {has_reply_markup}")
         
+        keywords = {match.lastgroup for match in _KEYWORD_RE.finditer(message_text)}
+        
         # Check for "چالش" (challenge) - can be in text or message might have photo
         print(f"[DEBUG] ENABLE_MATH_CHALLENGES: {ENABLE_MATH_CHALLENGES}")
         if ENABLE_MATH_CHALLENGES:
-            has_challenge_keyword = "چالش" in message_text
+            has_challenge_keyword = "challenge" in keywords
             print(f"[DEBUG] Checking for math challenge...")
             print(f"[DEBUG]   Keyword 'چالش' found: {has_challenge_keyword}")
             print(f"[DEBUG]   Has photo: {has_photo}")
@@ -159,17 +157,17 @@ async def handle_new_message(
                 print("[DEBUG] ✅ Math Challenge DETECTED (keyword 'چالش' found)")
                 logger.info(f"   ✅ Math Challenge DETECTED (keyword 'چالش' found)")
                 logger.info(f"   🚀 Starting math challenge processing...")
-                print("[DEBUG] 🚀 Creating task for math challenge processing...")
-                # Process in background task to not block other operations
-                asyncio.create_task(process_math_challenge(client, event.message, ocr_model, ocr_executor))
+                print("[DEBUG] 🚀 Queueing math challenge processing...")
+                # Hand off to the job worker to not block other operations
+                enqueue_job(process_math_challenge(client, event.message, ocr_model, ocr_executor))
             elif has_photo:
                 # Also process photos as they might be challenge images without the keyword in text
                 print("[DEBUG] ✅ Potential Math Challenge DETECTED (photo/document found)")
                 logger.info(f"   ✅ Potential Math Challenge DETECTED (photo/document found)")
                 logger.info(f"   🚀 Starting math challenge processing...")
-                print("[DEBUG] 🚀 Creating task for math challenge processing...")
-                # Process in background task to not block other operations
-                asyncio.create_task(process_math_challenge(client, event.message, ocr_model, ocr_executor))
+                print("[DEBUG] 🚀 Queueing math challenge processing...")
+                # Hand off to the job worker to not block other operations
+                enqueue_job(process_math_challenge(client, event.message, ocr_model, ocr_executor))
             else:
                 print("[DEBUG] ⏭️  Not a math challenge (no keyword 'چالش' and no photo)")
                 logger.debug(f"   ⏭️  Not a math challenge (no keyword 'چالش' and no photo)")
@@ -180,7 +178,7 @@ async def handle_new_message(
         # Check for "جعبه" (box)
         print(f"[DEBUG] ENABLE_BOX_MESSAGES: {ENABLE_BOX_MESSAGES}")
         if ENABLE_BOX_MESSAGES:
-            has_box_keyword = "جعبه" in message_text
+            has_box_keyword = "box" in keywords
             print(f"[DEBUG] Checking for box message...")
             print(f"[DEBUG]   Keyword 'جعبه' found: {has_box_keyword}")
             print(f"[DEBUG]   Has reply_markup: {has_reply_markup}")
@@ -188,9 +186,9 @@ async def handle_new_message(
                 print("[DEBUG] ✅ Box Message DETECTED (keyword 'جعبه' found)")
                 logger.info(f"   ✅ Box Message DETECTED (keyword 'جعبه' found)")
                 logger.info(f"   🚀 Starting box message processing...")
-                print("[DEBUG] 🚀 Creating task for box message processing...")
-                # Process in background task to not block other operations
-                asyncio.create_task(process_box_message(client, event.message))
+                print("[DEBUG] 🚀 Queueing box message processing...")
+                # Hand off to the job worker to not block other operations
+                enqueue_job(process_box_message(client, event.message))
             else:
                 print("[DEBUG] ⏭️  Not a box message (no keyword 'جعبه')")
                 logger.debug(f"   ⏭️  Not a box message (no keyword 'جعبه')")
@@ -201,10 +199,8 @@ async def handle_new_message(
         print("[DEBUG] MESSAGE HANDLER COMPLETED")
         print("=" * 60 + "\n")
             
-    except Exception as e:
+    except (errors.RPCError, OSError) as e:
         print(f"[DEBUG] ❌ ERROR in message handler: {e}")
         print("=" * 60)
         logger.error(f"Error handling new message: {e}", exc_info=True)
-        import traceback
-        print(f"[DEBUG] Traceback:\n{traceback.format_exc()}")
 
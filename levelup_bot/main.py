@@ -2,13 +2,12 @@
 
 import asyncio
 import logging
+import os
 import sys
 
-# Apply CPU patches BEFORE importing anything that uses ONNX
-from .ocr.cpu_patch import apply_cpu_patches
-apply_cpu_patches()
-
 from .bot import Bot
+from .config.settings import CLEAN_EXIT
+from .utils.event_loop import use_uvloop
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +35,9 @@ async def main():
     await bot.run()
 
 
-if __name__ == "__main__":
+def run():
+    """Synchronous entry point shared by ``python main.py``, ``python -m levelup_bot.main`` and ``levelup-bot``."""
+    use_uvloop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -52,5 +53,12 @@ if __name__ == "__main__":
     
     # Force exit to ensure process terminates
     logger.info("Exiting process...")
-    sys.exit(0)
+    if CLEAN_EXIT:
+        sys.exit(0)
+    # Everything was flushed/closed in Bot.shutdown(), so skip interpreter teardown
+    logging.shutdown()
+    os._exit(0)
 
+
+if __name__ == "__main__":
+    run()
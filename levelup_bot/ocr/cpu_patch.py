@@ -3,143 +3,114 @@
 import os
 import logging
 
+from ..utils.cpu import ocr_thread_count
+
 logger = logging.getLogger(__name__)
 
 
+def _cpu_session_options(ort):
+    """Build SessionOptions suited to occasional single-image OCR on CPU.
+    
+    Bounds the intra-op thread pool and disables spin-waiting so idle OCR
+    threads don't burn CPU that the asyncio loop needs.
+    
+    Args:
+        ort: The imported onnxruntime module
+    
+    Returns:
+        Configured onnxruntime.SessionOptions
+    """
+    so = ort.SessionOptions()
+    so.intra_op_num_threads = ocr_thread_count()
+    so.inter_op_num_threads = 1
+    so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    so.add_session_config_entry("session.intra_op.allow_spinning", "0")
+    return so
+
+
+def _cpu_only(providers):
+    """Filter providers to CPU-compatible ones (CPU and Azure) in a single pass."""
+    return [p for p in providers if ('CPU' in p or 'Azure' in p) and 'CUDA' not in p] or ['CPUExecutionProvider']
+
+
 def apply_cpu_patches():
     """Apply patches to force ONNX Runtime to use CPU only.
     
     This must be called before importing pix2text or any ONNX-dependent libraries.
+    Safe to call repeatedly: the originals are stored on the module and only
+    patched once.
+    
+    Returns:
+        True if ONNX Runtime is patched, False if it is not available
     """
     # Set environment variables early to force CPU usage for ONNX Runtime
     os.environ['ONNXRUNTIME_EXECUTION_PROVIDER'] = 'CPUExecutionProvider'
     os.environ['CUDA_VISIBLE_DEVICES'] = ''  # Hide CUDA devices to force CPU
+    os.environ.setdefault('OMP_WAIT_POLICY', 'PASSIVE')  # Idle OpenMP threads sleep instead of spinning
+    os.environ.setdefault('ORT_DISABLE_SPINNING', '1')  # Same for ORT pools built without our SessionOptions (allow_spinning=0)
+    os.environ.setdefault('OMP_NUM_THREADS', str(ocr_thread_count()))  # Match the ORT intra-op pool size
+    os.environ.setdefault('KMP_AFFINITY', 'granularity=fine,compact,1,0')  # Keep OpenMP threads on a compact core set
     
     # Patch ONNX Runtime BEFORE importing pix2text to force CPU usage
     try:
         import onnxruntime as ort
-        
-        # Store original functions
-        _original_get_available_providers = ort.get_available_providers
-        _original_InferenceSession = ort.InferenceSession
-        
-        def _get_available_providers_cpu_only():
-            """Return only CPU-compatible providers."""
-            providers = _original_get_available_providers()
-            # Filter to only CPU and Azure providers (both work on CPU)
-            cpu_providers = [p for p in providers if 'CPU' in p or 'Azure' in p]
-            # Always include CPUExecutionProvider as first choice
-            if 'CPUExecutionProvider' not in cpu_providers:
-                cpu_providers.insert(0, 'CPUExecutionProvider')
-            return cpu_providers
-        
-        def _InferenceSession_cpu_only(model_path, sess_options=None, providers=None, provider_options=None, **kwargs):
-            """Create InferenceSession with CPU providers only."""
-            # Force CPU providers
-            if providers is None:
-                providers = _get_available_providers_cpu_only()
-            else:
-                # Filter providers to only CPU-compatible ones
-                providers = [p for p in providers if 'CPU' in p or 'Azure' in p]
-                if not providers:
-                    providers = ['CPUExecutionProvider']
-            
-            # Remove CUDA from providers if somehow it got in
-            providers = [p for p in providers if 'CUDA' not in p]
-            
-            try:
-                return _original_InferenceSession(
-                    model_path,
-                    sess_options=sess_options,
-                    providers=providers,
-                    provider_options=provider_options,
-                    **kwargs
-                )
-            except ValueError as e:
-                # If still fails, try with only CPUExecutionProvider
-                if 'CUDAExecutionProvider' in str(e):
-                    providers = ['CPUExecutionProvider']
-                    return _original_InferenceSession(
-                        model_path,
-                        sess_options=sess_options,
-                        providers=providers,
-                        provider_options=provider_options,
-                        **kwargs
-                    )
-                raise
-        
-        # Apply patches immediately
-        ort.get_available_providers = _get_available_providers_cpu_only
-        ort.InferenceSession = _InferenceSession_cpu_only
-        
-        logger.debug("ONNX Runtime CPU patches applied successfully")
-        return True
     except ImportError:
         # onnxruntime not available yet, will patch later
         logger.debug("ONNX Runtime not available, skipping patches")
         return False
-
-
-def ensure_cpu_patches():
-    """Ensure CPU patches are applied, applying them if needed."""
-    try:
-        import onnxruntime as ort
-        
-        # Check if patches are already applied
-        if hasattr(ort, '_original_get_available_providers'):
-            return True
-        
-        # Apply patches inline if module-level ones don't exist
-        ort._original_get_available_providers = ort.get_available_providers
-        ort._original_InferenceSession = ort.InferenceSession
+    
+    # Check if patches are already applied
+    if hasattr(ort, '_original_InferenceSession'):
+        return True
+    
+    # Store original functions
+    ort._original_get_available_providers = ort.get_available_providers
+    ort._original_InferenceSession = ort.InferenceSession
+    
+    def _get_available_providers_cpu_only():
+        """Return only CPU-compatible providers."""
+        return _cpu_only(ort._original_get_available_providers())
+    
+    def _InferenceSession_cpu_only(model_path, sess_options=None, providers=None, provider_options=None, **kwargs):
+        """Create InferenceSession with CPU providers only."""
+        providers = _cpu_only(providers if providers is not None else ort._original_get_available_providers())
         
-        def get_cpu_providers():
-            """Return only CPU providers."""
-            providers = ort._original_get_available_providers()
-            cpu_providers = [p for p in providers if 'CPU' in p or 'Azure' in p]
-            if not cpu_providers:
-                cpu_providers = ['CPUExecutionProvider']
-            return cpu_providers
+        if sess_options is None:
+            sess_options = _cpu_session_options(ort)
         
-        def create_cpu_session(model_path, sess_options=None, providers=None, provider_options=None, **kwargs):
-            """Create InferenceSession with CPU providers only."""
-            if providers is None:
-                providers = get_cpu_providers()
-            else:
-                # Filter to only CPU-compatible providers
-                providers = [p for p in providers if 'CPU' in p or 'Azure' in p]
-                if not providers:
-                    providers = ['CPUExecutionProvider']
-            
-            # Remove any CUDA providers
-            providers = [p for p in providers if 'CUDA' not in p]
-            
-            try:
+        try:
+            return ort._original_InferenceSession(
+                model_path,
+                sess_options=sess_options,
+                providers=providers,
+                provider_options=provider_options,
+                **kwargs
+            )
+        except ValueError as e:
+            # If still fails, try with only CPUExecutionProvider
+            if 'CUDA' in str(e) or 'cuda' in str(e):
                 return ort._original_InferenceSession(
                     model_path,
                     sess_options=sess_options,
-                    providers=providers,
+                    providers=['CPUExecutionProvider'],
                     provider_options=provider_options,
                     **kwargs
                 )
-            except ValueError as e:
-                # If still fails, try with only CPUExecutionProvider
-                if 'CUDA' in str(e) or 'cuda' in str(e):
-                    providers = ['CPUExecutionProvider']
-                    return ort._original_InferenceSession(
-                        model_path,
-                        sess_options=sess_options,
-                        providers=providers,
-                        provider_options=provider_options,
-                        **kwargs
-                    )
-                raise
-        
-        ort.get_available_providers = get_cpu_providers
-        ort.InferenceSession = create_cpu_session
-        
-        logger.debug("ONNX Runtime CPU patches applied inline")
-        return True
+            raise
+    
+    # Apply patches immediately
+    ort.get_available_providers = _get_available_providers_cpu_only
+    ort.InferenceSession = _InferenceSession_cpu_only
+    
+    logger.debug("ONNX Runtime CPU patches applied successfully")
+    return True
+
+
+def ensure_cpu_patches():
+    """Ensure CPU patches are applied, applying them if needed."""
+    try:
+        return apply_cpu_patches()
     except Exception as e:
         logger.debug(f"Error applying CPU patches: {e}")
         return False
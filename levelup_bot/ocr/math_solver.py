@@ -2,19 +2,140 @@
 
 import re
 import logging
-from typing import Optional
+import operator
+from typing import Optional, Union
 
 logger = logging.getLogger(__name__)
 
+Number = Union[int, float]
 
-def parse_and_solve_math(text: str) -> Optional[float]:
+# Binary operators supported by the solver, dispatched by symbol
+_OPS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2}
+
+# Patterns compiled once at import instead of on every challenge
+_LATEX_ARRAY_RE = re.compile(r'\\begin\{array\}.*?\\end\{array\}', re.DOTALL)
+_LATEX_NUMBER_RE = re.compile(r'\{(\d+)\}')
+_MATH_RE = re.compile(r'(\d+(?:\.\d+)?)\s*([+\-*/])\s*(\d+(?:\.\d+)?)')
+_MATH_CLEAN_RE = re.compile(r'[^\d+\-*/.() ]')
+
+
+def _to_number(token: str) -> Number:
+    """Parse a numeric token, keeping integers as int."""
+    return float(token) if '.' in token else int(token)
+
+
+def _apply_operator(op: str, a: Number, b: Number) -> Optional[Number]:
+    """Apply a binary operator from the dispatch table.
+    
+    Returns:
+        The result, or None for division by zero
+    """
+    if op == '/':
+        if b == 0:
+            logger.warning("Division by zero detected")
+            return None
+        if isinstance(a, int) and isinstance(b, int):
+            # Exact integer division stays int; only a remainder makes it a float
+            quotient, remainder = divmod(a, b)
+            return quotient if remainder == 0 else a / b
+    return _OPS[op](a, b)
+
+
+def _safe_eval_math(expr: str) -> Optional[Number]:
+    """Evaluate an arithmetic expression without eval().
+    
+    Tokenizes numbers, ``+ - * /`` and parentheses, converts them to RPN
+    with the shunting-yard algorithm and evaluates the RPN on a stack.
+    
+    Args:
+        expr: Expression containing only digits, operators, dots, parentheses and spaces
+    
+    Returns:
+        The result, or None if the expression is malformed
+    """
+    output: list[Union[Number, str]] = []
+    ops: list[str] = []
+    expect_value = True
+    i, n = 0, len(expr)
+    
+    while i < n:
+        ch = expr[i]
+        if ch == ' ':
+            i += 1
+            continue
+        if ch.isdigit() or ch == '.':
+            if not expect_value:
+                return None
+            j = i + 1
+            while j < n and (expr[j].isdigit() or expr[j] == '.'):
+                j += 1
+            try:
+                output.append(_to_number(expr[i:j]))
+            except ValueError:
+                return None
+            expect_value = False
+            i = j
+            continue
+        if ch in _OPS:
+            if expect_value:
+                return None  # Unary operators are not supported
+            while ops and ops[-1] != '(' and _PRECEDENCE[ops[-1]] >= _PRECEDENCE[ch]:
+                output.append(ops.pop())
+            ops.append(ch)
+            expect_value = True
+        elif ch == '(':
+            if not expect_value:
+                return None
+            ops.append(ch)
+        elif ch == ')':
+            if expect_value:
+                return None
+            while ops and ops[-1] != '(':
+                output.append(ops.pop())
+            if not ops:
+                return None  # Unbalanced parentheses
+            ops.pop()
+        else:
+            return None
+        i += 1
+    
+    if expect_value:
+        return None
+    while ops:
+        op = ops.pop()
+        if op == '(':
+            return None  # Unbalanced parentheses
+        output.append(op)
+    
+    stack: list[Number] = []
+    for token in output:
+        if isinstance(token, str):
+            b = stack.pop()
+            a = stack.pop()
+            result = _apply_operator(token, a, b)
+            if result is None:
+                return None
+            stack.append(result)
+        else:
+            stack.append(token)
+    return stack[0] if len(stack) == 1 else None
+
+
+def parse_and_solve_math(text: str) -> Optional[Number]:
     """Parse math expression from text and solve it.
     
     Args:
         text: Text containing a math expression
-        
+    
     Returns:
-        The solution as a float, or None if parsing fails
+        The solution (int when every operand is an integer and any division
+        is exact, float otherwise), or None if parsing fails
     """
     try:
         if not text:
@@ -22,26 +143,23 @@ def parse_and_solve_math(text: str) -> Optional[float]:
         
         # Handle LaTeX array/matrix notation
         # Pattern: \begin{array} ... \end{array} with numbers
-        latex_array_pattern = r'\\begin\{array\}.*?\\end\{array\}'
-        if re.search(latex_array_pattern, text, re.DOTALL):
+        if _LATEX_ARRAY_RE.search(text):
             logger.debug("Detected LaTeX array notation, attempting to parse...")
             # Extract all numbers from the array
-            numbers = re.findall(r'\{(\d+)\}', text)
-            if numbers:
-                # Convert to integers
-                nums = [int(n) for n in numbers if n.isdigit()]
-                if nums:
-                    # For simple arrays, try common operations
-                    # If 2 numbers: add them
-                    # If 4+ numbers: sum all
-                    if len(nums) == 2:
-                        result = nums[0] + nums[1]
-                        logger.info(f"Solved LaTeX array (2 numbers): {nums[0]} + {nums[1]} = {result}")
-                        return float(result)
-                    elif len(nums) >= 2:
-                        result = sum(nums)
-                        logger.info(f"Solved LaTeX array (sum of {len(nums)} numbers): {nums} = {result}")
-                        return float(result)
+            numbers = _LATEX_NUMBER_RE.findall(text)
+            # For simple arrays, try common operations
+            # If 2 numbers: add them
+            # If 3+ numbers: sum all (the regex only captures digits, so int() is safe)
+            if len(numbers) == 2:
+                a, b = int(numbers[0]), int(numbers[1])
+                result = a + b
+                logger.info(f"Solved LaTeX array (2 numbers): {a} + {b} = {result}")
+                return result
+            elif len(numbers) > 2:
+                result = sum(map(int, numbers))
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Solved LaTeX array (sum of {len(numbers)} numbers): {[int(n) for n in numbers]} = {result}")
+                return result
         
         # Clean the text and extract math expression
         # Handle patterns like "12 + 3 = ?" or "12+3=?"
@@ -49,93 +167,39 @@ def parse_and_solve_math(text: str) -> Optional[float]:
         text = text.replace('×', '*').replace('÷', '/').replace('=', '').replace('?', '')
         text = text.replace('x', '*').replace('X', '*')  # Handle 'x' as multiplication
         # Remove LaTeX markers if present
-        text = re.sub(r'\$\$', '', text)  # Remove $$ markers
-        text = re.sub(r'\\begin\{array\}.*?\\end\{array\}', '', text, flags=re.DOTALL)  # Remove array blocks
+        text = text.replace('$$', '')  # Remove $$ markers
+        text = _LATEX_ARRAY_RE.sub('', text)  # Remove array blocks
         text = text.strip()
         
-        # Remove common OCR artifacts and noise
-        # Remove letters that might be OCR mistakes (but keep operators)
         # First, try to find the math expression pattern before cleaning too much
-        pattern = r'(\d+(?:\.\d+)?)\s*([+\-*/×÷])\s*(\d+(?:\.\d+)?)'
-        match = re.search(pattern, text)
-        
+        match = _MATH_RE.search(text)
         if match:
-            num1_str = match.group(1)
-            operator = match.group(2)
-            num2_str = match.group(3)
-            
-            # Normalize operator
-            operator = operator.replace('×', '*').replace('÷', '/')
-            
-            try:
-                num1 = float(num1_str)
-                num2 = float(num2_str)
-                
-                if operator == '+':
-                    result = num1 + num2
-                elif operator == '-':
-                    result = num1 - num2
-                elif operator == '*':
-                    result = num1 * num2
-                elif operator == '/':
-                    if num2 == 0:
-                        logger.warning("Division by zero detected")
-                        return None
-                    result = num1 / num2
-                else:
-                    return None
-                
-                logger.info(f"Solved: {num1} {operator} {num2} = {result}")
-                return result
-            except ValueError:
-                logger.warning(f"Could not convert numbers: {num1_str}, {num2_str}")
+            num1, op, num2 = _to_number(match.group(1)), match.group(2), _to_number(match.group(3))
+            result = _apply_operator(op, num1, num2)
+            if result is not None:
+                logger.info(f"Solved: {num1} {op} {num2} = {result}")
+            return result
         
-        # If no pattern match, try to extract and evaluate the expression
-        # Remove any non-math characters but keep operators and numbers
-        cleaned = re.sub(r'[^\d+\-*/.() ]', '', text)
-        cleaned = cleaned.strip()
+        # If no pattern match, remove any non-math characters but keep operators and numbers
+        cleaned = _MATH_CLEAN_RE.sub('', text).strip()
         
         if cleaned:
-            # Try to find a valid math expression in the cleaned text
             # Look for patterns like: number operator number
-            simple_pattern = r'(\d+(?:\.\d+)?)\s*([+\-*/])\s*(\d+(?:\.\d+)?)'
-            simple_match = re.search(simple_pattern, cleaned)
-            
+            simple_match = _MATH_RE.search(cleaned)
             if simple_match:
-                try:
-                    num1 = float(simple_match.group(1))
-                    operator = simple_match.group(2)
-                    num2 = float(simple_match.group(3))
-                    
-                    if operator == '+':
-                        result = num1 + num2
-                    elif operator == '-':
-                        result = num1 - num2
-                    elif operator == '*':
-                        result = num1 * num2
-                    elif operator == '/':
-                        if num2 == 0:
-                            return None
-                        result = num1 / num2
-                    else:
-                        return None
-                    
-                    logger.info(f"Solved (from cleaned text): {num1} {operator} {num2} = {result}")
+                num1, op, num2 = _to_number(simple_match.group(1)), simple_match.group(2), _to_number(simple_match.group(3))
+                result = _apply_operator(op, num1, num2)
+                if result is not None:
+                    logger.info(f"Solved (from cleaned text): {num1} {op} {num2} = {result}")
                     return result
-                except (ValueError, ZeroDivisionError):
-                    pass
             
-            # Last resort: try to evaluate the entire cleaned expression
-            # This is less safe but might work for simple expressions
-            try:
-                # Only evaluate if it looks like a simple math expression
-                if re.match(r'^[\d+\-*/.() ]+$', cleaned) and any(op in cleaned for op in ['+', '-', '*', '/']):
-                    result = eval(cleaned)
-                    if isinstance(result, (int, float)):
-                        logger.info(f"Solved (via eval): {cleaned} = {result}")
-                        return float(result)
-            except Exception as e:
-                logger.debug(f"Eval failed for '{cleaned}': {e}")
+            # Last resort: evaluate the entire cleaned expression with the safe evaluator
+            if any(op in cleaned for op in _OPS):
+                result = _safe_eval_math(cleaned)
+                if result is not None:
+                    logger.info(f"Solved (via expression evaluator): {cleaned} = {result}")
+                    return result
+                logger.debug(f"Expression evaluator rejected '{cleaned}'")
         
         logger.warning(f"Could not parse math expression from text: {text}")
         return None
@@ -1,65 +1,124 @@
 """OCR model initialization and management."""
 
+import asyncio
+import multiprocessing
 import os
 import warnings
 import logging
 from typing import Optional
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 
-from pix2text import Pix2Text
-
-from ..ocr.cpu_patch import ensure_cpu_patches
+from ..ocr.worker import init_worker, is_ready
 
 logger = logging.getLogger(__name__)
 
 
-async def initialize_ocr_model() -> tuple[Optional[Pix2Text], Optional[ThreadPoolExecutor]]:
+class OCRModel:
+    """Picklable handle to the worker's model.
+    
+    Pass ``ocr_model.recognize`` to ``loop.run_in_executor`` with the OCR
+    executor; the call itself runs inside the worker process. This class
+    lives here, away from pix2text, so the bot process can hold it cheaply.
+    """
+    
+    def recognize(self, image_bytes: bytes):
+        """Recognize text/formulas in an encoded image (runs in the worker).
+        
+        Args:
+            image_bytes: Raw image file bytes
+        
+        Returns:
+            Pix2Text recognition result
+        """
+        from ..ocr.worker import recognize_image
+        return recognize_image(image_bytes)
+
+
+# Live worker pool, swapped for a fresh one by restart_ocr_executor() if the worker dies
+_ocr_executor: Optional[ProcessPoolExecutor] = None
+_restart_lock = asyncio.Lock()
+
+
+async def _start_executor() -> Optional[ProcessPoolExecutor]:
+    """Start the single-worker OCR process and wait for it to load the model.
+    
+    Returns:
+        The ready executor, or None if the worker failed to load a model
+    """
+    # Spawn rather than fork: the parent already runs an event loop and Telethon's threads
+    ocr_executor = ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker
+    )
+    try:
+        # Loading happens in the worker's initializer; this waits for it to finish
+        ready = await asyncio.get_running_loop().run_in_executor(ocr_executor, is_ready)
+    except Exception as e:
+        logger.error(f"OCR worker process failed to start: {e}")
+        ready = False
+    
+    if not ready:
+        ocr_executor.shutdown(wait=False, cancel_futures=True)
+        return None
+    return ocr_executor
+
+
+async def initialize_ocr_model() -> tuple[Optional[OCRModel], Optional[ProcessPoolExecutor]]:
     """Initialize the OCR model for math problem recognition - CPU only.
     
+    The model lives in a persistent single-worker process; the returned
+    OCRModel is a handle whose ``recognize`` runs there.
+    
     Returns:
         Tuple of (ocr_model, ocr_executor) or (None, None) if initialization fails
     """
+    global _ocr_executor
     # Suppress ALL warnings
     warnings.filterwarnings('ignore')
     
-    # Force CPU mode - ensure environment variables are set
+    # Force CPU mode - ensure environment variables are set (inherited by the worker,
+    # which applies the ONNX Runtime CPU patches itself before importing pix2text)
     os.environ['ONNXRUNTIME_EXECUTION_PROVIDER'] = 'CPUExecutionProvider'
     os.environ['CUDA_VISIBLE_DEVICES'] = ''  # Hide CUDA devices
-    
-    # Ensure CPU patches are applied
-    ensure_cpu_patches()
+    os.environ.setdefault('OMP_WAIT_POLICY', 'PASSIVE')
     
     # Initialize OCR model with CPU only
     logger.info("Initializing OCR model with CPU only...")
     
-    # Try different initialization methods
-    initialization_methods = [
-        # Method 1: Try with formula recognition model
-        lambda: Pix2Text.from_config(dict(
-            formula=dict(model_name='breezedeus/pix2text-mfr')
-        )),
-        # Method 2: Simple initialization
-        lambda: Pix2Text(),
-    ]
+    _ocr_executor = await _start_executor()
+    if _ocr_executor is None:
+        logger.warning("OCR initialization failed. Math challenge processing disabled.")
+        return None, None
+    
+    logger.info("OCR model initialized successfully - Running on CPU in worker process")
+    return OCRModel(), _ocr_executor
+
+
+def get_ocr_executor() -> Optional[ProcessPoolExecutor]:
+    """Return the live OCR executor (a replacement if the original worker died)."""
+    return _ocr_executor
+
+
+async def restart_ocr_executor(broken: ProcessPoolExecutor) -> Optional[ProcessPoolExecutor]:
+    """Replace a broken OCR worker pool (e.g. after the worker was OOM-killed).
+    
+    Concurrent callers reporting the same broken pool share one restart.
     
-    for i, init_method in enumerate(initialization_methods, 1):
-        try:
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                logger.info(f"Trying OCR initialization method {i}...")
-                ocr_model = init_method()
-                ocr_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr")
-                logger.info("OCR model initialized successfully - Running on CPU")
-                return ocr_model, ocr_executor
-        except Exception as e:
-            logger.warning(f"OCR initialization method {i} failed: {e}")
-            if i == len(initialization_methods):
-                # Last method failed, log the error
-                logger.error(f"All OCR initialization methods failed. Last error: {e}")
-                logger.warning("OCR initialization failed. Math challenge processing disabled.")
-                return None, None
-            continue
+    Args:
+        broken: Executor that raised BrokenProcessPool
     
-    # Should not reach here, but just in case
-    logger.warning("OCR initialization failed. Math challenge processing disabled.")
-    return None, None
+    Returns:
+        The replacement executor, or None if the new worker failed to load
+    """
+    global _ocr_executor
+    async with _restart_lock:
+        if _ocr_executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            logger.warning("OCR worker process died, starting a new one...")
+            _ocr_executor = await _start_executor()
+            if _ocr_executor is None:
+                logger.error("OCR worker restart failed. Math challenge processing disabled.")
+            else:
+                logger.info("OCR worker process restarted")
+        return _ocr_executor
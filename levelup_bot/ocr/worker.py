@@ -0,0 +1,137 @@
+"""OCR worker process that owns the Pix2Text model.
+
+Recognition runs in a separate interpreter so pix2text's GIL-holding
+pre/post-processing never competes with the asyncio loop serving Telegram.
+The parent process imports this module only for ``init_worker`` and
+``is_ready``; pix2text, onnxruntime and PIL are imported inside the worker.
+"""
+
+import io
+import os
+import time
+import warnings
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from ..config.logging_config import setup_logging
+from ..config.settings import OCR_MFR_INT8_DIR
+from ..utils.cpu import ocr_thread_count
+from .cpu_patch import apply_cpu_patches
+
+if TYPE_CHECKING:
+    from pix2text import Pix2Text
+
+logger = logging.getLogger(__name__)
+
+# Model instance, only ever set inside the worker process
+_model: Optional["Pix2Text"] = None
+
+# Longest image side fed to the model; challenge images are far larger than the text needs
+_MAX_SIDE = 1024
+
+
+def _pin_worker():
+    """Pin the worker process (and the ORT threads it spawns) to a small core group (Linux only)."""
+    if hasattr(os, 'sched_setaffinity'):
+        try:
+            # Choose from the CPUs we're allowed on, not 0..n, which may be outside a container's cpuset
+            os.sched_setaffinity(0, set(sorted(os.sched_getaffinity(0))[:ocr_thread_count()]))
+        except OSError as e:
+            logger.debug(f"Could not set OCR worker affinity: {e}")
+
+
+def _warm_up(ocr_model: "Pix2Text"):
+    """Run one recognition on a blank image to pay ONNX graph/allocator setup up front.
+    
+    Args:
+        ocr_model: Freshly initialized OCR model
+    """
+    from PIL import Image
+    
+    dummy = Image.new("RGB", (256, 64))
+    start = time.perf_counter()
+    ocr_model.recognize(dummy)
+    logger.debug(f"OCR warm-up took {time.perf_counter() - start:.2f}s")
+
+
+def _load_model() -> Optional["Pix2Text"]:
+    """Try each initialization method in turn.
+    
+    Returns:
+        Initialized Pix2Text model, or None if every method failed
+    """
+    # Patch ONNX Runtime BEFORE importing pix2text so every session it creates is CPU-only
+    apply_cpu_patches()
+    from pix2text import Pix2Text
+    
+    initialization_methods = []
+    if os.path.isdir(OCR_MFR_INT8_DIR):
+        # Method 0: INT8-quantized formula model generated by quantize_mfr.py
+        initialization_methods.append(lambda: Pix2Text.from_config(dict(
+            text_formula=dict(formula=dict(model_name='mfr', model_backend='onnx', model_dir=OCR_MFR_INT8_DIR))
+        )))
+    initialization_methods += [
+        # Method 1: Try with formula recognition model
+        lambda: Pix2Text.from_config(dict(
+            formula=dict(model_name='breezedeus/pix2text-mfr')
+        )),
+        # Method 2: Simple initialization
+        lambda: Pix2Text(),
+    ]
+    
+    for i, init_method in enumerate(initialization_methods, 1):
+        try:
+            logger.info(f"Trying OCR initialization method {i}...")
+            return init_method()
+        except Exception as e:
+            logger.warning(f"OCR initialization method {i} failed: {e}")
+    
+    logger.error("All OCR initialization methods failed")
+    return None
+
+
+def init_worker():
+    """ProcessPoolExecutor initializer: load and warm up the model once per worker."""
+    global _model
+    # A spawned process starts with unconfigured logging, so load/warm-up lines would be lost
+    setup_logging()
+    # Suppress ALL warnings
+    warnings.filterwarnings('ignore')
+    _pin_worker()
+    
+    _model = _load_model()
+    if _model is None:
+        return
+    
+    # Warm up so the first challenge hits steady-state latency
+    try:
+        _warm_up(_model)
+    except Exception as e:
+        logger.debug(f"OCR warm-up failed (first challenge will be slower): {e}")
+
+
+def is_ready() -> bool:
+    """Report whether the worker loaded a model."""
+    return _model is not None
+
+
+def recognize_image(image_bytes: bytes):
+    """Recognize text/formulas in an encoded image with the worker's model.
+    
+    Args:
+        image_bytes: Raw image file bytes (kept encoded to keep IPC small)
+    
+    Returns:
+        Pix2Text recognition result
+    """
+    if _model is None:
+        raise RuntimeError("OCR model is not loaded in this process")
+    from PIL import Image
+    
+    image = Image.open(io.BytesIO(image_bytes))
+    # Let the JPEG decoder downscale by a power of two while decoding (no-op for other formats)
+    image.draft("RGB", (_MAX_SIDE, _MAX_SIDE))
+    image = image.convert("RGB")
+    if max(image.size) > _MAX_SIDE:
+        image.thumbnail((_MAX_SIDE, _MAX_SIDE), Image.Resampling.LANCZOS)
+    return _model.recognize(image)
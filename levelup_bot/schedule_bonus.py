@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Schedule bonus messages using Telegram's scheduled message feature.
+
+This script can be run once a day. It will:
+1. Connect to Telegram
+2. Find the target group
+3. Schedule first message for 1 minute later
+4. Schedule subsequent messages with random 3-5 minute intervals (cumulative)
+5. Continue scheduling until 100 messages are scheduled (Telegram rate limit)
+6. Exit immediately after scheduling (no waiting)
+
+Usage:
+    levelup-bot-schedule
+    python -m levelup_bot.schedule_bonus
+    python schedule_bonus.py
+"""
+
+import asyncio
+import itertools
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+
+from .config.settings import BONUS_MESSAGE, BONUS_INTERVAL_MIN, BONUS_INTERVAL_MAX
+from .config.logging_config import setup_logging
+from .telegram.ratelimit import TokenBucket
+from .utils.event_loop import use_uvloop
+
+logger = logging.getLogger(__name__)
+
+# Scheduling requests kept in flight at once
+SCHEDULE_CONCURRENCY = 20
+
+# All 100 sends go to one group, so pace them to Telegram's per-chat limit
+# (about 20 messages a minute), not the account-wide rate send_bucket allows
+schedule_bucket = TokenBucket(rate=20 / 60, burst=5)
+
+
+def _format_ts(ts):
+    """Format a Unix timestamp as a UTC date-time string for the log."""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+async def _schedule_one(client, peer, slot, schedule_time, semaphore, retry_queue):
+    """Schedule one bonus message.
+
+    Each send takes a token from schedule_bucket first, so the sends are paced
+    below the group's flood limit instead of waiting to be told off. A
+    FloodWait doesn't sleep here (holding a semaphore slot); the message goes on
+    retry_queue and is re-sent after the rest of the batch.
+
+    Args:
+        client: Telegram client instance
+        peer: Input peer of the target group, resolved once by the caller
+        slot: Position of the message in the schedule (0-based), kept for the retry pass
+        schedule_time: Unix timestamp (seconds) at which Telegram should post the message
+        semaphore: Bounds how many scheduling requests are in flight
+        retry_queue: Collects (slot, schedule_time, wait_seconds) for rate-limited sends
+
+    Returns:
+        schedule_time once Telegram has accepted the message, None if deferred to retry_queue
+    """
+    from telethon import errors  # Already loaded by schedule_bonus_messages, so just a lookup
+
+    async with semaphore:
+        await schedule_bucket.acquire()
+        try:
+            await client.send_message(peer, BONUS_MESSAGE, schedule=schedule_time)
+        except errors.FloodWaitError as e:
+            # Drain the bucket so the other in-flight sends back off too
+            schedule_bucket.penalize(e.seconds)
+            retry_queue.append((slot, schedule_time, e.seconds))
+            return None
+    return schedule_time
+
+
+async def schedule_bonus_messages():
+    """Schedule bonus messages using Telegram's scheduled message feature (max 100 messages)."""
+    # Setup logging
+    setup_logging()
+    # Telethon and the modules built on it load only once the scheduler actually runs
+    from .telegram.client import initialize_client, close_client
+    from .telegram.group import find_or_join_group
+
+    logger.info("=" * 60)
+    logger.info("Starting bonus message scheduler (100 messages max)")
+    logger.info("=" * 60)
+
+    # Initialize client
+    logger.info("Connecting to Telegram...")
+    client = await initialize_client()
+    if not client:
+        logger.error("Failed to initialize Telegram client")
+        return
+
+    try:
+        # Find or join group
+        logger.info("Finding target group...")
+        group_entity = await find_or_join_group(client)
+        if not group_entity:
+            logger.error("Failed to find or join target group")
+            return
+
+        logger.info(f"Target group: {group_entity.title} (ID: {group_entity.id})")
+        # Resolve the send target once rather than inside every one of the 100 sends
+        input_peer = await client.get_input_entity(group_entity)
+
+        # Calculate scheduling times (explicit UTC avoids local timezone offsets)
+        now = datetime.now(timezone.utc)
+        base_time = now + timedelta(minutes=1)  # First message in 1 minute
+        max_messages = 100  # Telegram rate limit: maximum 100 scheduled messages
+
+        logger.info("=" * 60)
+        logger.info("Starting to schedule messages...")
+        logger.info(f"Base time (first message): {base_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info(f"Maximum messages: {max_messages} (Telegram rate limit)")
+        logger.info("=" * 60)
+
+        # Schedule times: the first at base_time (1 minute later), then running sums
+        # of random 3-5 minute intervals up to 100 messages (Telegram rate limit)
+        # Plain epoch seconds all the way to Telethon, which accepts them for schedule=
+        base_ts = base_time.timestamp()
+        # A private generator skips the module-level random instance lookups
+        rng = random.Random()
+        offsets = itertools.accumulate(
+            (rng.uniform(BONUS_INTERVAL_MIN, BONUS_INTERVAL_MAX) for _ in range(max_messages - 1)),
+            initial=0.0
+        )
+
+        # Overlap the round-trips instead of waiting for each send before the next
+        semaphore = asyncio.Semaphore(SCHEDULE_CONCURRENCY)
+        retry_queue = []
+        results = await asyncio.gather(
+            *(
+                _schedule_one(client, input_peer, slot, int(base_ts + offset), semaphore, retry_queue)
+                for slot, offset in enumerate(offsets)
+            ),
+            return_exceptions=True
+        )
+
+        # Rate-limited messages wait out the longest FloodWait, then go again together,
+        # until every one of them has gone through
+        while retry_queue:
+            retries = [(slot, schedule_time) for slot, schedule_time, _ in retry_queue]
+            wait = max(seconds for _, _, seconds in retry_queue)
+            logger.warning(f"Rate limited on {len(retries)} message(s). Waiting {wait} seconds before retrying them...")
+            await asyncio.sleep(wait)
+            retry_queue = []
+            retry_results = await asyncio.gather(
+                *(_schedule_one(client, input_peer, slot, schedule_time, semaphore, retry_queue) for slot, schedule_time in retries),
+                return_exceptions=True
+            )
+            # Write each retry back into its original slot so numbering and order stay intact
+            for (slot, _), result in zip(retries, retry_results):
+                results[slot] = result
+
+        # Only the first and last scheduled times are needed for the summary
+        message_count = 0
+        first_time = last_time = None
+        for index, result in enumerate(results, 1):
+            if isinstance(result, Exception):
+                # Continue with next message even if one fails
+                logger.error(f"Error scheduling message {index}: {result}")
+                continue
+            schedule_time = result
+            message_count += 1
+            first_time = first_time or schedule_time
+            last_time = schedule_time
+            # Log every 50 messages to avoid spam; the timestamp is only formatted for those
+            if (index == 1 or index % 50 == 0) and logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Message %d: Scheduled for %s (cumulative: %.2f hours)",
+                    index, _format_ts(schedule_time), (schedule_time - base_ts) / 3600
+                )
+
+        # Summary
+        logger.info("=" * 60)
+        logger.info("Scheduling completed!")
+        logger.info(f"Total messages scheduled: {message_count} (limit: {max_messages})")
+        if message_count:
+            logger.info(f"First message: {_format_ts(first_time)}")
+            logger.info(f"Last message: {_format_ts(last_time)}")
+            logger.info(f"Total duration: {(last_time - base_ts) / 3600:.2f} hours")
+        logger.info("=" * 60)
+        logger.info("Script exiting. Messages will be sent automatically by Telegram.")
+        logger.info("=" * 60)
+
+    except KeyboardInterrupt:
+        logger.info("Scheduler interrupted by user")
+    except Exception as e:
+        logger.error(f"Error in scheduler: {e}", exc_info=True)
+    finally:
+        # Disconnect client
+        if client and client.is_connected():
+            logger.info("Disconnecting from Telegram...")
+            await close_client()
+            logger.info("Disconnected")
+
+
+def main():
+    """Main entry point."""
+    use_uvloop()
+    try:
+        asyncio.run(schedule_bonus_messages())
+    except KeyboardInterrupt:
+        logger.info("Script interrupted by user")
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,10 @@ import random
 import secrets
 import os
 import hashlib
-from telethon import TelegramClient
+from telethon import TelegramClient, errors
 from telethon.tl.types import Channel
 
-from ..config.settings import BONUS_MESSAGE, BONUS_INTERVAL_MIN, BONUS_INTERVAL_MAX
+from ..config.settings import BONUS_MESSAGE, BONUS_INTERVAL, BONUS_INTERVAL_MIN, BONUS_INTERVAL_MAX
 from ..telegram.messaging import send_bonus_message
 
 logger = logging.getLogger(__name__)
@@ -52,10 +52,14 @@ def _get_random_interval():
     return round(interval, 2)  # Round to 2 decimal places
 
 
+# A degenerate MIN == MAX range means a fixed interval; skip the reseed + RNG draw
+_get_interval = (lambda: BONUS_INTERVAL) if BONUS_INTERVAL_MIN == BONUS_INTERVAL_MAX else _get_random_interval
+
+
 async def bonus_message_loop(
     client: TelegramClient,
     group_entity: Channel,
-    running_flag: asyncio.Event
+    shutdown_event: asyncio.Event
 ):
     """Async loop that sends bonus messages with random intervals between MIN and MAX seconds.
     
@@ -64,49 +68,52 @@ async def bonus_message_loop(
     Args:
         client: Telegram client instance
         group_entity: Target group entity
-        running_flag: Event flag to control loop lifecycle
+        shutdown_event: Event set when the bot is shutting down; the loop exits promptly once set
     """
+    if shutdown_event.is_set():
+        return
+    
     # Send first bonus message immediately
-    if running_flag.is_set():
-        logger.info("Sending first bonus message immediately...")
-        await send_bonus_message(client, group_entity, BONUS_MESSAGE)
-        last_send_time = time.time()  # Track when message was actually sent
-        
-        # Get first random interval
-        next_interval = _get_random_interval()
-        logger.info(f"First bonus message sent. Next in {next_interval:.2f} seconds (random: {BONUS_INTERVAL_MIN}-{BONUS_INTERVAL_MAX}s)...")
+    logger.info("Sending first bonus message immediately...")
+    await send_bonus_message(client, group_entity, BONUS_MESSAGE)
+    last_send_time = time.time()  # Track when message was actually sent
+    
+    # Get first random interval
+    next_interval = _get_interval()
+    logger.info(f"First bonus message sent. Next in {next_interval:.2f} seconds (random: {BONUS_INTERVAL_MIN}-{BONUS_INTERVAL_MAX}s)...")
     
     # Then send with random intervals between MIN and MAX
-    while running_flag.is_set():
+    while not shutdown_event.is_set():
         try:
-            # Get a new random interval for this cycle
-            next_interval = _get_random_interval()
+            # Wait out the rest of the interval, measured from when the message was actually sent.
+            # If we're already past the interval, send immediately
+            sleep_time = next_interval - (time.time() - last_send_time)
+            if sleep_time > 0:
+                logger.debug(f"Waiting {sleep_time:.2f} seconds before next bonus message...")
+                try:
+                    # Returns early the moment shutdown is requested
+                    await asyncio.wait_for(shutdown_event.wait(), timeout=sleep_time)
+                except asyncio.TimeoutError:
+                    pass
             
-            # Calculate sleep time based on when message was actually sent
-            current_time = time.time()
-            time_since_last_send = current_time - last_send_time
-            sleep_time = next_interval - time_since_last_send
+            if shutdown_event.is_set():
+                break
             
-            # If we're already past the interval, send immediately
-            if sleep_time <= 0:
-                sleep_time = 0
-            else:
-                logger.info(f"Waiting {sleep_time:.2f} seconds before next bonus message...")
-                await asyncio.sleep(sleep_time)
+            logger.info(f"Sending bonus message (interval: {next_interval:.2f}s, range: {BONUS_INTERVAL_MIN}-{BONUS_INTERVAL_MAX}s)...")
+            await send_bonus_message(client, group_entity, BONUS_MESSAGE)
+            last_send_time = time.time()  # Update last send time to actual send completion
             
-            if running_flag.is_set():
-                logger.info(f"Sending bonus message (interval: {next_interval:.2f}s, range: {BONUS_INTERVAL_MIN}-{BONUS_INTERVAL_MAX}s)...")
-                await send_bonus_message(client, group_entity, BONUS_MESSAGE)
-                last_send_time = time.time()  # Update last send time to actual send completion
-                
-                # Get next random interval for the following cycle
-                next_interval = _get_random_interval()
-                logger.info(f"Bonus message sent. Next in {next_interval:.2f} seconds (random: {BONUS_INTERVAL_MIN}-{BONUS_INTERVAL_MAX}s)...")
+            # Get next random interval for the following cycle
+            next_interval = _get_interval()
+            logger.info(f"Bonus message sent. Next in {next_interval:.2f} seconds (random: {BONUS_INTERVAL_MIN}-{BONUS_INTERVAL_MAX}s)...")
         except asyncio.CancelledError:
             logger.info("Bonus message loop cancelled")
             raise
-        except Exception as e:
+        except (errors.RPCError, OSError, asyncio.TimeoutError, ValueError, TypeError) as e:
+            # ValueError/TypeError come from Telethon failing to resolve or serialize the peer
             logger.error(f"Error in bonus message loop: {e}")
-            if running_flag.is_set():
-                await asyncio.sleep(5)
-
+            # Back off before retrying, but return at once if shutdown is requested meanwhile
+            try:
+                await asyncio.wait_for(shutdown_event.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
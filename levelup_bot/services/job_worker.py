@@ -0,0 +1,43 @@
+"""Async consumer for work spawned by the message handler."""
+
+import asyncio
+import logging
+from typing import Coroutine
+
+logger = logging.getLogger(__name__)
+
+# Pending handler jobs (math challenges, box clicks), consumed on the event loop
+job_queue: "asyncio.Queue[Coroutine]" = asyncio.Queue()
+
+
+def enqueue_job(job: Coroutine):
+    """Queue a handler coroutine for the job worker.
+    
+    Args:
+        job: Coroutine to run, e.g. ``process_box_message(client, message)``
+    """
+    job_queue.put_nowait(job)
+
+
+async def job_worker_loop():
+    """Run queued handler jobs one at a time until cancelled.
+    
+    Each worker awaits a single job before taking the next, so a slow OCR
+    job only occupies its own worker; HANDLER_WORKERS of these run side by side.
+    """
+    while True:
+        job = await job_queue.get()
+        try:
+            await job
+        except Exception as e:
+            # Keep consuming: one broken job must not stall every later challenge/box
+            logger.error(f"Handler job {job.__qualname__} failed: {e}", exc_info=True)
+        finally:
+            job_queue.task_done()
+
+
+def discard_pending_jobs():
+    """Close jobs that never started so they don't warn about not being awaited."""
+    while not job_queue.empty():
+        job_queue.get_nowait().close()
+        job_queue.task_done()
@@ -2,26 +2,59 @@
 
 import asyncio
 import logging
-import queue
 import random
+import time
+from collections import deque
 from typing import List
 
-from ..config.settings import ENABLE_WORD_SENDING, MIN_MESSAGE_DELAY, MAX_MESSAGE_DELAY
+from telethon import TelegramClient, errors
+from telethon.tl.types import Channel, Message
+
+from ..config.settings import (
+    ENABLE_WORD_SENDING,
+    MIN_MESSAGE_DELAY,
+    MAX_MESSAGE_DELAY,
+    AUTO_DELETE_WORD_MESSAGES,
+    DELETE_WAIT_TIME,
+)
+from ..telegram.messaging import send_message_to_group
 
 logger = logging.getLogger(__name__)
 
+# Words and delays are drawn this many at a time instead of once per message
+_RNG_BATCH_SIZE = 256
+
+# Strong references to pending auto-delete tasks so they aren't garbage collected
+_pending_deletes: set[asyncio.Task] = set()
+
+
+async def _delete_after_delay(sent_message: Message):
+    """Delete a sent word message after DELETE_WAIT_TIME seconds.
+    
+    Args:
+        sent_message: Message to delete
+    """
+    await asyncio.sleep(DELETE_WAIT_TIME)
+    try:
+        await sent_message.delete()
+        logger.debug(f"Auto-deleted word message after {DELETE_WAIT_TIME}s")
+    except (errors.RPCError, OSError) as e:
+        logger.debug(f"Could not delete message (may have been deleted already): {e}")
+
 
 async def word_sender_loop(
+    client: TelegramClient,
+    group_entity: Channel,
     wordlist: List[str],
-    message_queue: queue.Queue,
-    running_flag: asyncio.Event
+    shutdown_event: asyncio.Event
 ):
     """Main loop that sends random words to the group.
     
     Args:
+        client: Telegram client instance
+        group_entity: Target group entity
         wordlist: List of words to send
-        message_queue: Queue to add messages to
-        running_flag: Event flag to control loop lifecycle
+        shutdown_event: Event that stops the loop as soon as it is set
     """
     if not ENABLE_WORD_SENDING:
         logger.info("Word sending is disabled. Exiting main loop.")
@@ -40,27 +73,48 @@ async def word_sender_loop(
     
     logger.info(f"Starting main message loop ({MIN_MESSAGE_DELAY}-{MAX_MESSAGE_DELAY}s delay = {rate_info})...")
     
-    while running_flag.is_set():
+    word_buffer: deque[str] = deque()
+    delay_buffer: deque[float] = deque()
+    
+    # Sends are scheduled against a monotonic deadline, so the time spent inside
+    # send_message_to_group (network latency, FloodWait retries) comes out of the
+    # delay instead of being added on top of it and dragging the rate down.
+    next_send_at = time.monotonic()
+    
+    while not shutdown_event.is_set():
         try:
-            # Select random word
-            word = random.choice(wordlist)
-            
-            # Add message to queue
-            message_queue.put({
-                'type': 'word',
-                'message': word
-            })
+            if not word_buffer:
+                word_buffer.extend(random.choices(wordlist, k=_RNG_BATCH_SIZE))
+            if not delay_buffer:
+                delay_buffer.extend(random.uniform(MIN_MESSAGE_DELAY, MAX_MESSAGE_DELAY) for _ in range(_RNG_BATCH_SIZE))
             
-            logger.info(f"Queued word: {word}")
+            # Select random word and send it directly from the event loop
+            word = word_buffer.popleft()
+            sent_message = await send_message_to_group(client, group_entity, word)
             
-            # Random delay between MIN and MAX
-            delay = random.uniform(MIN_MESSAGE_DELAY, MAX_MESSAGE_DELAY)
-            await asyncio.sleep(delay)
+            # Auto-delete message after DELETE_WAIT_TIME if enabled
+            if AUTO_DELETE_WORD_MESSAGES and sent_message:
+                task = asyncio.create_task(_delete_after_delay(sent_message))
+                _pending_deletes.add(task)
+                task.add_done_callback(_pending_deletes.discard)
             
+            # Random delay between MIN and MAX to achieve target messages/hour
+            # Note: If auto-delete is enabled, the delay already accounts for the deletion wait time
+            # If the send overran its slot (e.g. a long FloodWait), go again right away but
+            # restart the schedule from now rather than firing a burst of catch-up sends
+            now = time.monotonic()
+            next_send_at = max(now, next_send_at + delay_buffer.popleft())
+            delay = next_send_at - now
+            try:
+                # Returns early the moment shutdown is requested
+                await asyncio.wait_for(shutdown_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+        
         except asyncio.CancelledError:
             logger.info("Main loop cancelled")
             raise
-        except Exception as e:
+        except (errors.RPCError, OSError, asyncio.TimeoutError, ValueError, TypeError) as e:
+            # ValueError/TypeError come from Telethon failing to resolve or serialize the peer
             logger.error(f"Error in main loop: {e}")
             await asyncio.sleep(5)
-
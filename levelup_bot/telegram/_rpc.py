@@ -0,0 +1,51 @@
+"""Shared error handling for functions that call the Telegram API."""
+
+import asyncio
+import functools
+import logging
+from telethon import errors
+
+logger = logging.getLogger(__name__)
+
+
+def telethon_rpc(default=None, retries: int = 2):
+    """Wrap an async Telegram call with FloodWait retries and error logging.
+    
+    FloodWaitError sleeps for the requested time; transient server, timeout
+    and network errors back off exponentially (0.5s, 1s, 2s... capped at 60s).
+    No sleep follows the final attempt. Other RPC errors return ``default``;
+    anything else is a bug and propagates.
+    
+    Args:
+        default: Value returned when the call fails
+        retries: Extra attempts made after a FloodWait or transient error
+    
+    Returns:
+        Decorator for async functions
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(retries + 1):
+                last_attempt = attempt == retries
+                try:
+                    return await func(*args, **kwargs)
+                except errors.FloodWaitError as e:
+                    if last_attempt:
+                        logger.error(f"{func.__name__} still rate limited after {retries} retries: {e}")
+                        break
+                    logger.warning(f"Rate limited in {func.__name__}. Waiting {e.seconds} seconds...")
+                    await asyncio.sleep(e.seconds)
+                except (errors.ServerError, errors.TimedOutError, OSError, asyncio.TimeoutError) as e:
+                    if last_attempt:
+                        logger.error(f"{func.__name__} failed after {retries} retries: {e}")
+                        break
+                    backoff = min(60, 0.5 * 2 ** attempt)
+                    logger.warning(f"Transient error in {func.__name__}: {e}. Retrying in {backoff}s...")
+                    await asyncio.sleep(backoff)
+                except errors.RPCError as e:
+                    logger.error(f"{func.__name__} failed: {e}")
+                    return default
+            return default
+        return wrapper
+    return decorator
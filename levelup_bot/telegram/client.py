@@ -2,17 +2,115 @@
 
 import logging
 import asyncio
+import os
+import sqlite3
+import time
+from pathlib import Path
 from typing import Optional
 from telethon import TelegramClient
-from telethon.errors import PersistentTimestampOutdatedError
+from telethon.errors import PersistentTimestampOutdatedError, RPCError
+from telethon.network import ConnectionTcpAbridged
 
-from ..config.settings import API_ID, API_HASH, SESSION_NAME
+from ..config.settings import API_ID, API_HASH, SESSION_NAME, SESSION_SYNC_MAX_AGE
 
 logger = logging.getLogger(__name__)
 
+# Sidecar file whose mtime records the last successful session sync
+SYNC_MARKER = Path(f"{SESSION_NAME}.sync")
+
+# Shared client so re-entrant callers reuse one authenticated connection
+_client_singleton: Optional[TelegramClient] = None
+_client_lock = asyncio.Lock()
+
+# Strong reference to the background catch-up so it isn't garbage collected
+_catch_up_task: Optional[asyncio.Task] = None
+
+
+def _session_sync_age() -> float:
+    """Return seconds since the last successful session sync (inf if never synced)."""
+    try:
+        return time.time() - os.path.getmtime(SYNC_MARKER)
+    except OSError:
+        return float("inf")
+
+
+def _mark_session_synced():
+    """Touch the sync marker after a successful session sync."""
+    try:
+        SYNC_MARKER.touch()
+    except OSError as e:
+        logger.debug(f"Could not update session sync marker: {e}")
+
+
+def _tune_session_db(client: TelegramClient):
+    """Put the SQLite session in WAL mode with NORMAL syncs.
+    
+    Telethon rewrites the session (update state, cached entities) throughout a
+    run; WAL turns each of those commits into an append instead of a full
+    rollback-journal fsync cycle. A no-op for non-SQLite sessions.
+    
+    Args:
+        client: Freshly created Telegram client
+    """
+    conn = getattr(client.session, "_conn", None)
+    if conn is None:
+        return
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    except sqlite3.Error as e:
+        logger.debug(f"Could not tune session database: {e}")
+
+
+async def _safe_catch_up(client: TelegramClient):
+    """Catch up the session in the background, logging the outcome."""
+    try:
+        print("[DEBUG] Attempting to catch up session...")
+        await client.catch_up()
+        _mark_session_synced()
+        print("[DEBUG] ✅ Session caught up successfully")
+        logger.debug("Session caught up")
+    except (RPCError, OSError, asyncio.TimeoutError) as catch_up_error:
+        print(f"[DEBUG] ⚠️  Could not catch up session: {catch_up_error}")
+        logger.warning("Could not catch up session: %s", catch_up_error)
+        logger.debug("This is usually harmless, continuing anyway")
+
+
+def _start_background_catch_up(client: TelegramClient):
+    """Schedule a session catch-up without blocking client initialization."""
+    global _catch_up_task
+    _catch_up_task = asyncio.create_task(_safe_catch_up(client))
+
 
 async def initialize_client() -> Optional[TelegramClient]:
-    """Initialize and connect Telegram client.
+    """Initialize and connect the shared Telegram client.
+    
+    Repeated calls return the already-connected client instead of paying
+    for a new MTProto handshake.
+    
+    Returns:
+        TelegramClient instance if successful, None otherwise
+    """
+    global _client_singleton
+    async with _client_lock:
+        if _client_singleton is not None and _client_singleton.is_connected():
+            logger.debug("Reusing connected Telegram client")
+            return _client_singleton
+        _client_singleton = await _create_client()
+        return _client_singleton
+
+
+async def close_client():
+    """Disconnect the shared Telegram client and clear the cached instance."""
+    global _client_singleton
+    async with _client_lock:
+        client, _client_singleton = _client_singleton, None
+    if client is not None:
+        await client.disconnect()
+
+
+async def _create_client() -> Optional[TelegramClient]:
+    """Create, start, and sync a new Telegram client.
     
     Handles PersistentTimestampOutdatedError by syncing the session state.
     
@@ -27,7 +125,20 @@ async def initialize_client() -> Optional[TelegramClient]:
     
     try:
         print("[DEBUG] Creating TelegramClient instance...")
-        client = TelegramClient(SESSION_NAME, API_ID, API_HASH)
+        client = TelegramClient(
+            SESSION_NAME,
+            API_ID,
+            API_HASH,
+            connection=ConnectionTcpAbridged,  # 1-byte length prefix for short packets
+            connection_retries=5,
+            retry_delay=1,
+            auto_reconnect=True,
+            request_retries=3,
+            flood_sleep_threshold=60,  # Let telethon absorb short FloodWaits itself
+            device_model="levelup-bot",
+            system_version="1.0",
+        )
+        _tune_session_db(client)
         
         print("[DEBUG] Starting client connection...")
         await client.start()
@@ -42,30 +153,30 @@ async def initialize_client() -> Optional[TelegramClient]:
             logger.warning("Client reports not connected after start()")
         
         # Sync session state to fix PersistentTimestampOutdatedError
-        print("[DEBUG] Syncing session state...")
-        logger.info("🔄 Syncing session state to prevent timestamp errors...")
-        try:
-            # Call get_dialogs to refresh session state
-            print("[DEBUG] Calling get_dialogs(limit=1) to refresh session...")
-            await client.get_dialogs(limit=1)
-            print("[DEBUG] ✅ Session state synced successfully")
-            logger.info("✅ Session state synced successfully")
-        except PersistentTimestampOutdatedError:
-            print("[DEBUG] ⚠️  PersistentTimestampOutdatedError detected")
-            logger.warning("⚠️  PersistentTimestampOutdatedError detected, attempting to catch up...")
+        # (skipped when a recent restart already synced, saving a round-trip)
+        sync_age = _session_sync_age()
+        if sync_age < SESSION_SYNC_MAX_AGE:
+            print(f"[DEBUG] Session synced {sync_age:.0f}s ago, skipping get_dialogs")
+            logger.debug("Session synced %.0fs ago, skipping sync", sync_age)
+        else:
+            print("[DEBUG] Syncing session state...")
+            logger.debug("Syncing session state to prevent timestamp errors")
             try:
-                # Try to catch up the session
-                print("[DEBUG] Attempting to catch up session...")
-                await client.catch_up()
-                print("[DEBUG] ✅ Session caught up successfully")
-                logger.info("✅ Session caught up successfully")
-            except Exception as catch_up_error:
-                print(f"[DEBUG] ⚠️  Could not catch up session: {catch_up_error}")
-                logger.warning(f"⚠️  Could not catch up session: {catch_up_error}")
-                logger.info("   This is usually harmless, continuing anyway...")
-        except Exception as sync_error:
-            print(f"[DEBUG] Session sync warning (non-critical): {sync_error}")
-            logger.debug(f"Session sync warning (non-critical): {sync_error}")
+                # Call get_dialogs to refresh session state
+                print("[DEBUG] Calling get_dialogs(limit=1) to refresh session...")
+                await client.get_dialogs(limit=1)
+                _mark_session_synced()
+                print("[DEBUG] ✅ Session state synced successfully")
+                logger.debug("Session state synced")
+            except PersistentTimestampOutdatedError:
+                print("[DEBUG] ⚠️  PersistentTimestampOutdatedError detected")
+                logger.warning("Catching up session after timestamp error")
+                # Replaying updates can take seconds on large accounts, so let
+                # startup continue while it runs
+                _start_background_catch_up(client)
+            except (RPCError, OSError, asyncio.TimeoutError) as sync_error:
+                print(f"[DEBUG] Session sync warning (non-critical): {sync_error}")
+                logger.debug("Session sync warning (non-critical): %s", sync_error)
         
         # Final connection check
         final_connected = client.is_connected()
@@ -79,7 +190,7 @@ async def initialize_client() -> Optional[TelegramClient]:
             print("[DEBUG] ❌ WARNING: Client may not be ready to receive messages!")
         
         return client
-    except Exception as e:
+    except (OSError, RPCError) as e:  # ConnectionError is an OSError
         print(f"[DEBUG] ❌ ERROR: Failed to initialize client: {e}")
         print("=" * 60)
         logger.error(f"Failed to initialize client: {e}")
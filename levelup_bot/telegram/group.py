@@ -1,15 +1,121 @@
 """Group finding and joining functionality."""
 
+import json
 import logging
+import time
+from pathlib import Path
 from typing import Optional
+from weakref import WeakKeyDictionary
 from telethon import TelegramClient, errors
-from telethon.tl.types import Channel
+from telethon.tl.functions.messages import CheckChatInviteRequest, ImportChatInviteRequest
+from telethon.tl.types import Channel, InputPeerChannel
 
-from ..config.settings import GROUP_NAME, GROUP_INVITE_URL
+from ..config.settings import GROUP_NAME, GROUP_INVITE_URL, DIALOG_INDEX_TTL, SESSION_NAME
+from ._rpc import telethon_rpc
 
 logger = logging.getLogger(__name__)
 
+# Resolved groups keyed by "GROUP_NAME|GROUP_INVITE_URL", reused across reconnects
+_group_cache: dict[str, Channel] = {}
 
+# Resolved group persisted across restarts; access hashes are per account, so one file per session
+GROUP_CACHE_FILE = Path(f"{SESSION_NAME}.group.json")
+
+# Per-client (built_at, title index, first non-archived group); entries vanish with their client
+_dialog_index_cache: "WeakKeyDictionary[TelegramClient, tuple[float, dict[str, Channel], Optional[Channel]]]" = WeakKeyDictionary()
+
+
+async def _build_dialog_index(client: TelegramClient) -> tuple[dict[str, Channel], Optional[Channel]]:
+    """Map lowercased titles to group entities in a single dialog pass.
+    
+    The same pass also records the first non-archived group, so the
+    "first group from dialogs" fallback doesn't need a scan of its own.
+    
+    Args:
+        client: Telegram client instance
+        
+    Returns:
+        Tuple of (dict of lowercased group title to Channel, first dialog wins
+        on duplicates; first non-archived group or None)
+    """
+    index: dict[str, Channel] = {}
+    first_group: Optional[Channel] = None
+    async for dialog in client.iter_dialogs(limit=200, ignore_migrated=True):
+        entity = dialog.entity
+        if isinstance(entity, Channel) and not entity.broadcast:
+            index.setdefault(entity.title.lower(), entity)
+            if first_group is None and not dialog.archived:
+                first_group = entity
+    return index, first_group
+
+
+async def _get_dialog_index(client: TelegramClient) -> dict[str, Channel]:
+    """Return the client's dialog index, rebuilding it once DIALOG_INDEX_TTL expires.
+    
+    Args:
+        client: Telegram client instance
+        
+    Returns:
+        Dict of lowercased group title to Channel
+    """
+    cached = _dialog_index_cache.get(client)
+    if cached is not None and time.monotonic() - cached[0] < DIALOG_INDEX_TTL:
+        return cached[1]
+    
+    index, first_group = await _build_dialog_index(client)
+    _dialog_index_cache[client] = (time.monotonic(), index, first_group)
+    return index
+
+
+def _save_group_cache(cache_key: str, group_entity: Channel):
+    """Persist the resolved group so the next startup can skip the lookup."""
+    try:
+        GROUP_CACHE_FILE.write_text(json.dumps({
+            "key": cache_key,
+            "id": group_entity.id,
+            "hash": group_entity.access_hash,
+        }))
+    except OSError as e:
+        logger.debug(f"Could not write group cache: {e}")
+
+
+async def _load_group_cache(client: TelegramClient, cache_key: str) -> Optional[Channel]:
+    """Resolve the group saved by a previous run and confirm the account is still in it.
+    
+    A saved group that can't be resolved or that the account has left is
+    discarded and GROUP_CACHE_FILE is deleted.
+    
+    Args:
+        client: Telegram client instance
+        cache_key: Current "GROUP_NAME|GROUP_INVITE_URL" key; a file saved under other settings is ignored
+        
+    Returns:
+        Channel entity if the account is still a member of the cached group, None otherwise
+    """
+    try:
+        cached = json.loads(GROUP_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    if cached.get("key") != cache_key:
+        return None
+    
+    try:
+        group_entity = await client.get_entity(InputPeerChannel(cached["id"], cached["hash"]))
+        if not isinstance(group_entity, Channel) or group_entity.left:
+            raise ValueError("account is no longer a member")
+        # A public group stays resolvable after leaving it, so confirm membership too
+        await client.get_permissions(group_entity, "me")
+    except (KeyError, ValueError, errors.RPCError) as e:  # RPCError includes ChannelPrivateError, UserNotParticipantError
+        logger.debug(f"Cached group from {GROUP_CACHE_FILE} is no longer valid: {e}")
+        try:
+            GROUP_CACHE_FILE.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"Could not delete group cache: {e}")
+        return None
+    return group_entity
+
+
+@telethon_rpc(default=None)
 async def find_group_by_name(client: TelegramClient, group_name: str) -> Optional[Channel]:
     """Find a group by name from dialogs.
     
@@ -20,25 +126,41 @@ async def find_group_by_name(client: TelegramClient, group_name: str) -> Optiona
     Returns:
         Channel entity if found, None otherwise
     """
-    try:
-        if not group_name:
-            return None
-        
-        logger.info(f"Searching for group: '{group_name}' in dialogs...")
-        async for dialog in client.iter_dialogs():
-            if isinstance(dialog.entity, Channel) and not dialog.entity.broadcast:
-                # Check if the title matches (case-insensitive)
-                if dialog.entity.title.lower() == group_name.lower():
-                    logger.info(f"Found group: {dialog.entity.title}")
-                    return dialog.entity
-        
-        logger.warning(f"Group '{group_name}' not found in dialogs")
+    if not group_name:
         return None
-    except Exception as e:
-        logger.error(f"Error finding group by name: {e}")
+    
+    logger.info(f"Searching for group: '{group_name}' in dialogs...")
+    # Case-insensitive match via one hash lookup instead of per-dialog compares
+    group_entity = (await _get_dialog_index(client)).get(group_name.lower())
+    if group_entity:
+        logger.info(f"Found group: {group_entity.title}")
+        return group_entity
+    
+    logger.warning(f"Group '{group_name}' not found in dialogs")
+    return None
+
+
+async def _check_invite(client: TelegramClient, invite_hash: str) -> Optional[Channel]:
+    """Resolve the group behind an invite hash the account has already joined.
+    
+    CheckChatInvite takes the bare hash, so it also works when GROUP_INVITE_URL is just the hash.
+    
+    Args:
+        client: Telegram client instance
+        invite_hash: Invite hash (without the t.me prefix)
+        
+    Returns:
+        Channel entity if the invite resolves to a joined group, None otherwise
+    """
+    try:
+        check_result = await client(CheckChatInviteRequest(invite_hash))
+    except errors.RPCError as e:  # RPCError includes FloodWaitError
+        logger.debug(f"Could not resolve invite link entity: {e}")
         return None
+    return getattr(check_result, 'chat', None)
 
 
+@telethon_rpc(default=None)
 async def join_group_via_invite(client: TelegramClient, invite_url: str) -> Optional[Channel]:
     """Join a group using an invite link.
     
@@ -49,54 +171,40 @@ async def join_group_via_invite(client: TelegramClient, invite_url: str) -> Opti
     Returns:
         Channel entity if successful, None otherwise
     """
+    if not invite_url:
+        return None
+    
+    # Extract invite hash from URL
+    if "t.me/joinchat/" in invite_url or "t.me/+" in invite_url:
+        invite_hash = invite_url.split("/")[-1]
+    else:
+        invite_hash = invite_url
+    
     try:
-        if not invite_url:
-            return None
-        
-        # Extract invite hash from URL
-        if "t.me/joinchat/" in invite_url or "t.me/+" in invite_url:
-            invite_hash = invite_url.split("/")[-1]
-        else:
-            invite_hash = invite_url
-        
-        try:
-            from telethon.tl.functions.messages import ImportChatInviteRequest
-            result = await client(ImportChatInviteRequest(invite_hash))
-            logger.info(f"Successfully joined group via invite")
-            # Get the entity after joining
-            group_entity = await client.get_entity(result.chats[0])
-            return group_entity
-        except errors.InviteHashExpiredError:
-            logger.warning("Invite link has expired or invalid")
-            return None
-        except errors.UsersTooMuchError:
-            logger.error("Group is full")
-            return None
-        except errors.UserAlreadyParticipantError:
-            logger.info("Already a member of the group (trying to find it in dialogs...)")
-            # Try to get entity from invite link info
-            try:
-                from telethon.tl.functions.messages import CheckChatInviteRequest
-                check_result = await client(CheckChatInviteRequest(invite_hash))
-                if hasattr(check_result, 'chat'):
-                    group_entity = check_result.chat
-                    logger.info(f"Found group: {group_entity.title}")
-                    return group_entity
-            except:
-                pass
-            return None
-        except Exception as e:
-            logger.error(f"Error joining group: {e}")
-            return None
-    except Exception as e:
-        logger.error(f"Failed to join group: {e}")
+        result = await client(ImportChatInviteRequest(invite_hash))
+        logger.info(f"Successfully joined group via invite")
+        # The Updates result usually carries the full Channel, no need to fetch it again
+        group_entity = next((chat for chat in result.chats if isinstance(chat, Channel)), None)
+        return group_entity or await _check_invite(client, invite_hash)
+    except errors.InviteHashExpiredError:
+        logger.warning("Invite link has expired or invalid")
         return None
+    except errors.UsersTooMuchError:
+        logger.error("Group is full")
+        return None
+    except errors.UserAlreadyParticipantError:
+        logger.info("Already a member of the group (trying to find it in dialogs...)")
+        group_entity = await _check_invite(client, invite_hash)
+        if group_entity is not None:
+            logger.info(f"Found group: {group_entity.title}")
+        return group_entity
 
 
 async def find_or_join_group(client: TelegramClient) -> Optional[Channel]:
     """Find or join the target group using configured settings.
     
     Priority:
+    0. Group saved by a previous run under the same settings (GROUP_CACHE_FILE)
     1. Find by name (if GROUP_NAME is set)
     2. Try invite link (if GROUP_INVITE_URL is set)
     3. Use first group from dialogs
@@ -107,7 +215,24 @@ async def find_or_join_group(client: TelegramClient) -> Optional[Channel]:
     Returns:
         Channel entity if found/joined, None otherwise
     """
-    group_entity = None
+    cache_key = f"{GROUP_NAME}|{GROUP_INVITE_URL}"
+    cached = _group_cache.get(cache_key)
+    if cached is not None:
+        # One participant lookup confirms we're still in the group, far cheaper than a dialog scan
+        try:
+            await client.get_permissions(cached, "me")
+            logger.info(f"Using cached target group: {cached.title} (ID: {cached.id})")
+            return cached
+        except (errors.RPCError, ValueError) as e:  # e.g. ChannelPrivateError, UserNotParticipantError
+            logger.debug(f"Cached group entity is no longer valid: {e}")
+            _group_cache.pop(cache_key, None)
+    
+    # Group resolved by a previous run, skipping the dialog scans below
+    group_entity = await _load_group_cache(client, cache_key)
+    if group_entity:
+        logger.info(f"Using saved target group: {group_entity.title} (ID: {group_entity.id})")
+        _group_cache[cache_key] = group_entity
+        return group_entity
     
     # Priority 1: Find by name
     if GROUP_NAME:
@@ -122,14 +247,20 @@ async def find_or_join_group(client: TelegramClient) -> Optional[Channel]:
     # Priority 3: Use first group from dialogs
     if not group_entity:
         logger.warning("Group not found by name or invite. Trying to find first group from dialogs...")
-        try:
-            async for dialog in client.iter_dialogs(limit=50):
-                if isinstance(dialog.entity, Channel) and not dialog.entity.broadcast:
-                    group_entity = dialog.entity
-                    logger.info(f"Using first group from dialogs: {group_entity.title}")
-                    break
-        except Exception as e:
-            logger.error(f"Error finding group from dialogs: {e}")
+        cached = _dialog_index_cache.get(client)
+        if cached is not None and time.monotonic() - cached[0] < DIALOG_INDEX_TTL:
+            # The name lookup's dialog pass already noted the first group
+            group_entity = cached[2]
+        else:
+            try:
+                async for dialog in client.iter_dialogs(limit=20, archived=False, ignore_migrated=True):
+                    if isinstance(dialog.entity, Channel) and not dialog.entity.broadcast:
+                        group_entity = dialog.entity
+                        break
+            except (errors.RPCError, OSError) as e:
+                logger.error(f"Error finding group from dialogs: {e}")
+        if group_entity:
+            logger.info(f"Using first group from dialogs: {group_entity.title}")
     
     if not group_entity:
         logger.error("No group available!")
@@ -140,4 +271,6 @@ async def find_or_join_group(client: TelegramClient) -> Optional[Channel]:
         return None
     
     logger.info(f"Target group found: {group_entity.title} (ID: {group_entity.id})")
+    _group_cache[cache_key] = group_entity
+    _save_group_cache(cache_key, group_entity)
     return group_entity
@@ -2,38 +2,189 @@
 
 import asyncio
 import logging
+import time
+from typing import Optional
 from telethon import TelegramClient, errors
-from telethon.tl.types import Channel
+from telethon.tl.types import Channel, Message
+
+from ..config.settings import ENABLE_MESSAGE_BATCHING, MESSAGE_BATCH_FLUSH_INTERVAL, MESSAGE_BATCH_MAX_CHARS, MIN_MESSAGE_DELAY
+from .ratelimit import send_bucket
+from ._rpc import telethon_rpc
 
 logger = logging.getLogger(__name__)
 
+# Local alias keeps the hot except-clause lookup short
+_FloodWait = errors.FloodWaitError
 
-async def send_message_to_group(client: TelegramClient, group_entity: Channel, message: str):
-    """Send a message to the group.
+
+class MessageBatcher:
+    """Coalesces messages bound for the same group into one newline-joined send.
+    
+    Messages are buffered per group and flushed either after ``flush_interval``
+    seconds or as soon as the next message would push the batch past ``max_chars``.
+    Each enqueued message gets a Future. Only the first message of a batch
+    resolves to the sent Message; the rest resolve to None, so a caller that
+    deletes what it sent (AUTO_DELETE_WORD_MESSAGES) deletes the batch once.
+    """
+    
+    def __init__(self, flush_interval: float = MESSAGE_BATCH_FLUSH_INTERVAL, max_chars: int = MESSAGE_BATCH_MAX_CHARS):
+        self.flush_interval = flush_interval
+        self.max_chars = max_chars
+        self._buffers: dict[int, list[tuple[str, asyncio.Future]]] = {}
+        self._buffer_chars: dict[int, int] = {}
+        self._flush_tasks: dict[int, asyncio.Task] = {}
+        # Strong references to overflow flushes so they aren't garbage collected mid-send
+        self._overflow_flushes: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+    
+    async def enqueue(self, client: TelegramClient, group_entity: Channel, message: str) -> asyncio.Future:
+        """Add a message to the group's batch.
+        
+        Args:
+            client: Telegram client instance
+            group_entity: Target group/channel entity
+            message: Message text to send
+            
+        Returns:
+            Future resolved once the batch is flushed: the sent Message for the first
+            message of the batch, None for the others or if the send failed
+        """
+        future = asyncio.get_running_loop().create_future()
+        key = group_entity.id
+        async with self._lock:
+            buffer = self._buffers.setdefault(key, [])
+            # Flush right away if this message would overflow the current batch
+            if buffer and self._buffer_chars[key] + len(message) + 1 > self.max_chars:
+                batch = self._take(key)
+                task = asyncio.create_task(self._flush(client, group_entity, batch))
+                self._overflow_flushes.add(task)
+                task.add_done_callback(self._overflow_flush_done)
+                buffer = self._buffers.setdefault(key, [])
+            buffer.append((message, future))
+            self._buffer_chars[key] = self._buffer_chars.get(key, 0) + len(message) + 1
+            if key not in self._flush_tasks:
+                self._flush_tasks[key] = asyncio.create_task(self._flush_later(client, group_entity))
+        return future
+    
+    def _overflow_flush_done(self, task: asyncio.Task):
+        """Drop a finished overflow flush and log anything it raised."""
+        self._overflow_flushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Overflow batch flush failed: {task.exception()}", exc_info=task.exception())
+    
+    def _take(self, key: int) -> list[tuple[str, asyncio.Future]]:
+        """Detach the pending batch for a group (caller must hold the lock)."""
+        batch = self._buffers.pop(key, [])
+        self._buffer_chars.pop(key, None)
+        flush_task = self._flush_tasks.pop(key, None)
+        if flush_task and flush_task is not asyncio.current_task():
+            flush_task.cancel()
+        return batch
+    
+    async def _flush_later(self, client: TelegramClient, group_entity: Channel):
+        """Flush the group's batch after the flush interval elapses."""
+        await asyncio.sleep(self.flush_interval)
+        async with self._lock:
+            batch = self._take(group_entity.id)
+        await self._flush(client, group_entity, batch)
+    
+    async def _flush(self, client: TelegramClient, group_entity: Channel, batch: list[tuple[str, asyncio.Future]]):
+        """Send a batch as one message, retrying the same batch on FloodWait."""
+        if not batch:
+            return
+        text = "\n".join(message for message, _ in batch)
+        sent_message = None
+        try:
+            while True:
+                try:
+                    await send_bucket.acquire()
+                    sent_message = await client.send_message(group_entity, text)
+                    logger.debug("Sent batch of %d message(s) to group", len(batch))
+                    break
+                except _FloodWait as e:
+                    logger.warning(f"Rate limited. Waiting {e.seconds} seconds before resending batch...")
+                    send_bucket.penalize(e.seconds)
+                    await asyncio.sleep(e.seconds)
+                except (errors.RPCError, OSError) as e:
+                    logger.error(f"Error sending message batch to group: {e}")
+                    break
+        finally:
+            # Never leave a waiting sender hanging, even if the flush is cancelled.
+            # The shared Message goes to one caller only, so it isn't deleted N times.
+            for i, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result(sent_message if i == 0 else None)
+
+
+_batcher: Optional[MessageBatcher] = None
+
+# Monotonic time of the last send, shared by word and bonus messages
+_last_send_ts: float = 0.0
+_send_spacing_lock = asyncio.Lock()
+
+
+async def _wait_for_send_slot():
+    """Keep at least MIN_MESSAGE_DELAY between consecutive sends."""
+    global _last_send_ts
+    async with _send_spacing_lock:
+        wait = _last_send_ts + MIN_MESSAGE_DELAY - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        _last_send_ts = time.monotonic()
+
+
+# Words and bonuses are worth a few extra attempts before being dropped
+@telethon_rpc(default=None, retries=4)
+async def _send(client: TelegramClient, group_entity: Channel, text: str) -> Optional[Message]:
+    """Send text to the group, pacing it through the shared rate limiter.
     
     Args:
         client: Telegram client instance
         group_entity: Target group/channel entity
-        message: Message text to send
+        text: Message text to send
         
     Returns:
         Message object if successful, None otherwise
     """
+    if not group_entity:
+        logger.error("Group entity not set")
+        return None
+    
+    await _wait_for_send_slot()
+    await send_bucket.acquire()
     try:
-        if not group_entity:
-            logger.error("Group entity not set")
-            return None
+        return await client.send_message(group_entity, text)
+    except _FloodWait as e:
+        # Drain the bucket, then let telethon_rpc sleep and retry
+        send_bucket.penalize(e.seconds)
+        raise
+
+
+async def send_message_to_group(client: TelegramClient, group_entity: Channel, message: str) -> Optional[Message]:
+    """Send a message to the group.
+    
+    When ENABLE_MESSAGE_BATCHING is on, the message is coalesced with other
+    pending messages and this resolves once the shared batch has been sent;
+    only the first message of the batch gets the sent Message back.
+    
+    Args:
+        client: Telegram client instance
+        group_entity: Target group/channel entity
+        message: Message text to send
         
-        sent_message = await client.send_message(group_entity, message)
-        logger.info(f"Sent message to group: {message[:50]}...")
-        return sent_message
-    except errors.FloodWaitError as e:
-        logger.warning(f"Rate limited. Waiting {e.seconds} seconds...")
-        await asyncio.sleep(e.seconds)
-        return None
-    except Exception as e:
-        logger.error(f"Error sending message to group: {e}")
-        return None
+    Returns:
+        Message object if successful, None otherwise
+    """
+    if ENABLE_MESSAGE_BATCHING and group_entity:
+        global _batcher
+        if _batcher is None:
+            _batcher = MessageBatcher()
+        return await (await _batcher.enqueue(client, group_entity, message))
+    
+    sent_message = await _send(client, group_entity, message)
+    if sent_message and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sent message to group: %s...", message[:50] if len(message) > 50 else message)
+    return sent_message
 
 
 async def send_bonus_message(client: TelegramClient, group_entity: Channel, bonus_message: str) -> bool:
@@ -47,19 +198,7 @@ async def send_bonus_message(client: TelegramClient, group_entity: Channel, bonu
     Returns:
         True if successful, False otherwise
     """
-    try:
-        if not group_entity:
-            logger.error("Group entity not set")
-            return False
-        
-        await client.send_message(group_entity, bonus_message)
-        logger.info(f"Sent bonus message to group: {bonus_message}")
-        return True
-    except errors.FloodWaitError as e:
-        logger.warning(f"Rate limited. Waiting {e.seconds} seconds...")
-        await asyncio.sleep(e.seconds)
+    if await _send(client, group_entity, bonus_message) is None:
         return False
-    except Exception as e:
-        logger.error(f"Error sending bonus message: {e}")
-        return False
-
+    logger.info("Sent bonus message to group: %s", bonus_message)
+    return True
@@ -0,0 +1,54 @@
+"""Token bucket rate limiting for outgoing Telegram requests."""
+
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Async token bucket that paces requests below Telegram's flood limits.
+    
+    Tokens refill continuously at ``rate`` per second up to ``burst``. Each
+    ``acquire()`` consumes one token, sleeping (with a little jitter) when the
+    bucket is empty.
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens: float = burst
+        self.last: float = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        """Add tokens for the time elapsed since the last refill."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+    
+    async def acquire(self):
+        """Wait until a token is available and consume it."""
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                # Jitter avoids waking every waiter at the same instant
+                await asyncio.sleep((1 - self.tokens) / self.rate + random.random() * 0.05)
+                self._refill()
+            self.tokens -= 1
+    
+    def penalize(self, seconds: float):
+        """Drain tokens after a FloodWait so the bucket self-corrects.
+        
+        Args:
+            seconds: FloodWait duration reported by Telegram
+        """
+        self._refill()
+        self.tokens -= seconds * self.rate
+        logger.debug(f"Rate limiter penalized for {seconds}s (tokens: {self.tokens:.1f})")
+
+
+# Process-wide bucket shared by every send path; an overall ceiling, not a per-chat limit
+send_bucket = TokenBucket(rate=30, burst=20)
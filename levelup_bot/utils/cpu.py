@@ -0,0 +1,54 @@
+"""CPU budget detection for sizing OCR threads."""
+
+import functools
+import math
+import os
+from pathlib import Path
+from typing import Optional
+
+# Upper bound on OCR threads; one image at a time gains little beyond this
+MAX_OCR_THREADS = 4
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    """Read the container CPU quota in CPUs (cgroup v2, then v1).
+    
+    Returns:
+        Quota as a number of CPUs, or None if unlimited or unavailable
+    """
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+@functools.cache
+def effective_cpus() -> int:
+    """Number of CPUs this process can actually use.
+    
+    Takes the smaller of the CPU affinity mask and the cgroup quota, so
+    containers with a fractional or small quota don't get oversized pools.
+    
+    Returns:
+        Usable CPU count (at least 1)
+    """
+    if hasattr(os, "sched_getaffinity"):
+        available = len(os.sched_getaffinity(0))
+    else:
+        available = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        available = min(available, math.ceil(quota))
+    return max(1, available)
+
+
+def ocr_thread_count() -> int:
+    """Thread count for the OCR runtime: the CPU budget, capped at MAX_OCR_THREADS."""
+    return min(MAX_OCR_THREADS, effective_cpus())
@@ -0,0 +1,23 @@
+"""Event loop selection for the entry points."""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def use_uvloop() -> bool:
+    """Switch asyncio to uvloop's libuv-based loop when it is installed (not available on Windows).
+    
+    Must run before ``asyncio.run``.
+    
+    Returns:
+        True if uvloop was installed as the event loop policy
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop")
+    return True
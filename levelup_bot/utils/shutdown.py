@@ -3,51 +3,63 @@
 import asyncio
 import logging
 import signal
+import sys
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
-def setup_signal_handlers(shutdown_event: Optional[asyncio.Event], event_loop: Optional[asyncio.AbstractEventLoop]):
+def setup_signal_handlers(
+    shutdown_event: Optional[asyncio.Event],
+    event_loop: Optional[asyncio.AbstractEventLoop],
+    main_task: Optional[asyncio.Task] = None
+):
     """Setup signal handlers for graceful shutdown.
     
+    On POSIX the handlers are registered with ``loop.add_signal_handler`` so they
+    run directly on the event loop. Windows falls back to ``signal.signal``.
+    
     Args:
         shutdown_event: Event to set when shutdown is requested
         event_loop: Async event loop to signal shutdown in
+        main_task: Top-level application task, cancelled if a second signal
+            arrives while shutdown is already under way (or on the first
+            signal when there is no shutdown_event)
     """
-    def signal_handler(signum, frame):
-        """Handle shutdown signals."""
+    def request_shutdown(signum):
+        """Request a graceful shutdown (runs on the loop)."""
         logger.info("")
         logger.info("=" * 60)
         logger.info(f"🛑 Received shutdown signal ({signum})")
         logger.info("=" * 60)
         
-        # Use the provided event_loop if available
-        current_loop = event_loop
-        
-        # If event loop is running, set the shutdown event to break out of wait
-        if current_loop and current_loop.is_running() and shutdown_event:
-            # Schedule setting the shutdown event in the event loop (thread-safe)
-            def set_shutdown():
-                shutdown_event.set()
-            current_loop.call_soon_threadsafe(set_shutdown)
-            
-            # Also cancel all tasks to ensure quick shutdown
-            try:
-                tasks = [task for task in asyncio.all_tasks(current_loop) if not task.done()]
-                for task in tasks:
-                    task.cancel()
-            except Exception as e:
-                logger.debug(f"Error cancelling tasks: {e}")
-        elif shutdown_event:
-            # If shutdown_event exists but loop isn't running or available,
-            # try to set it directly (this is safe if called before event loop starts)
+        # The application waits on the event and cancels its own tasks from there
+        if shutdown_event and not shutdown_event.is_set():
+            shutdown_event.set()
+        elif main_task is not None:
+            # Repeated signal (or nothing to set): stop waiting on a stuck shutdown
+            main_task.cancel()
+    
+    if event_loop and sys.platform != 'win32':
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            event_loop.add_signal_handler(signum, request_shutdown, signum)
+        return
+    
+    def signal_handler(signum, frame):
+        """Handle shutdown signals outside the event loop (Windows fallback)."""
+        loop, event = event_loop, shutdown_event
+        if loop is not None and loop.is_running():
+            # Marshal onto the loop thread, since asyncio objects aren't thread-safe
             try:
-                shutdown_event.set()
-            except:
+                loop.call_soon_threadsafe(request_shutdown, signum)
+                return
+            except RuntimeError:
+                # Loop closed between the check and the call; fall through
                 pass
+        if event is not None:
+            # Loop isn't running, so setting the event directly is safe
+            event.set()
     
     # Register signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
-
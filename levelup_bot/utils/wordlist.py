@@ -1,35 +1,111 @@
 """Wordlist loading utility."""
 
+import asyncio
 import logging
+import mmap
+import sys
 from pathlib import Path
+from typing import BinaryIO, Iterator
 
 logger = logging.getLogger(__name__)
 
 
+def _open_wordlist(filename: str) -> tuple[Path, BinaryIO]:
+    """Open the wordlist, falling back to wordlist.txt in root.
+    
+    Opening directly (instead of checking existence first) saves a stat per candidate.
+    
+    Args:
+        filename: Preferred path to the wordlist file
+    
+    Returns:
+        Tuple of the opened path and its binary file object
+    
+    Raises:
+        FileNotFoundError: If neither the given file nor the fallback exists
+    """
+    # Try data/wordlist.txt first, then fallback to wordlist.txt in root for backward compatibility
+    for candidate in (Path(filename), Path("wordlist.txt")):
+        try:
+            return candidate, open(candidate, 'rb')
+        except FileNotFoundError:
+            continue
+    raise FileNotFoundError(filename)
+
+
+def _iter_words(f: BinaryIO) -> Iterator[str]:
+    """Yield non-empty, stripped words from an open wordlist file via mmap.
+    
+    The mapping is copied and decoded in one call, then split, instead of
+    reading and decoding line by line.
+    """
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files cannot be memory-mapped
+        return
+    with mm:
+        text = mm[:].decode('utf-8')
+    for line in text.splitlines():
+        word = line.strip()
+        if word:
+            yield word
+
+
+def iter_wordlist(filename: str = "data/wordlist.txt") -> Iterator[str]:
+    """Lazily yield words from the wordlist file.
+    
+    The file is memory-mapped and decoded in a single pass; words are
+    stripped and filtered as they are consumed.
+    
+    Args:
+        filename: Path to the wordlist file
+    
+    Yields:
+        Non-empty, stripped words from the file
+    
+    Raises:
+        FileNotFoundError: If neither the given file nor the fallback exists
+    """
+    _, f = _open_wordlist(filename)
+    with f:
+        yield from _iter_words(f)
+
+
 def load_wordlist(filename: str = "data/wordlist.txt") -> list[str]:
     """Load words from wordlist.txt file.
     
+    Words are interned since the same strings are reused for the bot's lifetime.
+    
     Args:
         filename: Path to the wordlist file
-        
+    
     Returns:
         List of words from the file
     """
     try:
-        # Try data/wordlist.txt first, then fallback to wordlist.txt in root
-        wordlist_path = Path(filename)
-        if not wordlist_path.exists():
-            # Fallback to root directory for backward compatibility
-            wordlist_path = Path("wordlist.txt")
-        
-        with open(wordlist_path, 'r', encoding='utf-8') as f:
-            words = [line.strip() for line in f if line.strip()]
-        logger.info(f"Loaded {len(words)} words from {wordlist_path}")
-        return words
+        wordlist_path, f = _open_wordlist(filename)
     except FileNotFoundError:
-        logger.error(f"Wordlist file '{wordlist_path}' not found!")
+        logger.error(f"Wordlist file '{filename}' not found!")
         return []
+    
+    try:
+        with f:
+            words = [sys.intern(word) for word in _iter_words(f)]
+        logger.info(f"Loaded {len(words)} words from {wordlist_path}")
+        return words
     except Exception as e:
         logger.error(f"Error loading wordlist: {e}")
         return []
 
+
+async def load_wordlist_async(filename: str = "data/wordlist.txt") -> list[str]:
+    """Load the wordlist in a worker thread so the event loop stays free.
+    
+    Args:
+        filename: Path to the wordlist file
+    
+    Returns:
+        List of words from the file
+    """
+    return await asyncio.to_thread(load_wordlist, filename)
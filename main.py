@@ -1,61 +1,10 @@
-"""Main entry point for LevelUp Bot."""
+"""Main entry point for LevelUp Bot.
 
-import asyncio
-import logging
-import sys
-
-# Apply CPU patches BEFORE importing anything that uses ONNX
-# This must be done at the very top level
-import os
-os.environ['ONNXRUNTIME_EXECUTION_PROVIDER'] = 'CPUExecutionProvider'
-os.environ['CUDA_VISIBLE_DEVICES'] = ''  # Hide CUDA devices to force CPU
-
-# Import and apply CPU patches
-from levelup_bot.ocr.cpu_patch import apply_cpu_patches
-apply_cpu_patches()
-
-from levelup_bot.bot import Bot
-
-logger = logging.getLogger(__name__)
-
-
-async def main():
-    """Main async function."""
-    # Print initial startup message
-    print("\n" + "=" * 60)
-    print("🤖 LevelUp Bot")
-    print("=" * 60)
-    print("Initializing...\n")
-    
-    # Create and initialize bot
-    bot = Bot()
-    
-    # Initialize all components
-    if not await bot.initialize():
-        logger.error("❌ Bot initialization failed")
-        return
-    
-    # Start all services
-    await bot.start()
-    
-    # Run until shutdown
-    await bot.run()
+Delegates to levelup_bot.main so every way of starting the bot shares the
+same event loop setup and exit path.
+"""
 
+from levelup_bot.main import run
 
 if __name__ == "__main__":
-    try:
-        asyncio.run(main())
-    except KeyboardInterrupt:
-        logger.info("")
-        logger.info("=" * 60)
-        logger.info("🛑 Bot stopped by user")
-        logger.info("=" * 60)
-    except Exception as e:
-        logger.error("")
-        logger.error("=" * 60)
-        logger.error(f"❌ Fatal error: {e}")
-        logger.error("=" * 60)
-    
-    # Force exit to ensure process terminates
-    logger.info("Exiting process...")
-    sys.exit(0)
+    run()
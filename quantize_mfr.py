@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Quantize the pix2text MFR (formula recognition) ONNX model to INT8.
+This script can be run once after pix2text has downloaded its models. It will:
+1. Read the FP32 MFR encoder/decoder ONNX files
+2. Apply dynamic INT8 quantization (per-channel weights)
+3. Write them, with the tokenizer/config files, to OCR_MFR_INT8_DIR
+The bot picks up the quantized model automatically when that directory exists.
+Usage:
+    python quantize_mfr.py [SOURCE_MODEL_DIR]
+"""
+import logging
+import shutil
+import sys
+from pathlib import Path
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from levelup_bot.config.settings import OCR_MFR_INT8_DIR
+from levelup_bot.config.logging_config import setup_logging
+logger = logging.getLogger(__name__)
+
+# Default download location of the pix2text 1.1 MFR ONNX model
+DEFAULT_SOURCE_DIR = Path.home() / ".pix2text" / "1.1" / "mfr-onnx"
+
+
+def quantize_mfr(source_dir: Path, target_dir: Path) -> bool:
+    """Quantize every ONNX file in source_dir into target_dir.
+
+    Args:
+        source_dir: Directory containing the FP32 MFR model
+        target_dir: Directory to write the INT8 model to
+
+    Returns:
+        True if at least one ONNX file was quantized, False otherwise
+    """
+    onnx_files = sorted(source_dir.glob("*.onnx"))
+    if not onnx_files:
+        logger.error(f"No ONNX files found in {source_dir}")
+        return False
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    # Tokenizer and generation configs are needed unchanged next to the model
+    for path in source_dir.iterdir():
+        if path.is_file() and path.suffix != ".onnx":
+            shutil.copy2(path, target_dir / path.name)
+
+    for path in onnx_files:
+        logger.info(f"Quantizing {path.name}...")
+        quantize_dynamic(
+            path,
+            target_dir / path.name,  # Keep file names so pix2text loads them as-is
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+        )
+
+    logger.info(f"INT8 model written to {target_dir}")
+    return True
+
+
+if __name__ == "__main__":
+    setup_logging()
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SOURCE_DIR
+    sys.exit(0 if quantize_mfr(source, Path(OCR_MFR_INT8_DIR)) else 1)
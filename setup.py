@@ -23,16 +23,23 @@ setup(
         "Programming Language :: Python :: 3.11",
     ],
     python_requires=">=3.11",
+    # Ranges rather than exact pins so pip can pick a prebuilt wheel for the platform;
+    # requirements.txt keeps the exact tested versions
     install_requires=[
-        "pillow==12.0.0",
-        "pix2text==1.1.4",
-        "python-dotenv==1.2.1",
-        "requests==2.32.5",
-        "Telethon==1.42.0",
+        "pillow>=11,<13",
+        "pix2text>=1.1.4,<1.2",
+        "python-dotenv>=1.0,<2",
+        "requests>=2.32,<3",
+        "Telethon>=1.40,<2",
     ],
+    extras_require={
+        # Faster event loop, picked up automatically by main.py when installed
+        "uvloop": ["uvloop>=0.19; sys_platform != 'win32'"],
+    },
     entry_points={
         "console_scripts": [
-            "levelup-bot=levelup_bot.main:main",
+            "levelup-bot=levelup_bot.main:run",
+            "levelup-bot-schedule=levelup_bot.schedule_bonus:main",
         ],
     },
 )
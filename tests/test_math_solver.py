@@ -0,0 +1,77 @@
+"""Tests for the math expression solver."""
+
+import unittest
+
+from levelup_bot.ocr.math_solver import _safe_eval_math, parse_and_solve_math
+
+
+class SafeEvalMathTest(unittest.TestCase):
+    """_safe_eval_math evaluates arithmetic without eval()."""
+
+    def test_precedence(self):
+        self.assertEqual(_safe_eval_math("2 + 3 * 4"), 14)
+        self.assertEqual(_safe_eval_math("10 - 4 / 2"), 8)
+        self.assertEqual(_safe_eval_math("8 - 3 - 2"), 3)
+        self.assertEqual(_safe_eval_math("16 / 4 / 2"), 2)
+
+    def test_parentheses(self):
+        self.assertEqual(_safe_eval_math("(2 + 3) * 4"), 20)
+        self.assertEqual(_safe_eval_math("2 * (3 + (4 - 1))"), 12)
+
+    def test_unbalanced_parentheses(self):
+        self.assertIsNone(_safe_eval_math("(2 + 3"))
+        self.assertIsNone(_safe_eval_math("2 + 3)"))
+        self.assertIsNone(_safe_eval_math(")2 + 3("))
+
+    def test_unary_and_malformed_input(self):
+        self.assertIsNone(_safe_eval_math("-2 + 3"))
+        self.assertIsNone(_safe_eval_math("2 * -3"))
+        self.assertIsNone(_safe_eval_math("2 +"))
+        self.assertIsNone(_safe_eval_math("2 3"))
+        self.assertIsNone(_safe_eval_math("1.2.3 + 1"))
+        self.assertIsNone(_safe_eval_math(""))
+
+    def test_division_by_zero(self):
+        self.assertIsNone(_safe_eval_math("4 / 0"))
+        self.assertIsNone(_safe_eval_math("4 / (2 - 2)"))
+
+    def test_exact_division_stays_int(self):
+        result = _safe_eval_math("12 / 4 + 1")
+        self.assertEqual(result, 4)
+        self.assertIsInstance(result, int)
+
+    def test_inexact_division_is_float(self):
+        self.assertEqual(_safe_eval_math("7 / 2"), 3.5)
+        self.assertIsInstance(_safe_eval_math("1.5 * 2"), float)
+
+
+class ParseAndSolveMathTest(unittest.TestCase):
+    """parse_and_solve_math extracts and solves the challenge expression."""
+
+    def test_simple_expression(self):
+        self.assertEqual(parse_and_solve_math("12 + 3 = ?"), 15)
+        self.assertEqual(parse_and_solve_math("6 × 7 = ?"), 42)
+
+    def test_exact_division_stays_int(self):
+        result = parse_and_solve_math("12 ÷ 4 = ?")
+        self.assertEqual(result, 3)
+        self.assertIsInstance(result, int)
+
+    def test_division_by_zero(self):
+        self.assertIsNone(parse_and_solve_math("5 / 0 = ?"))
+
+    def test_latex_array_two_numbers(self):
+        text = r"$$\begin{array}{r}{12}\\{30}\end{array}$$"
+        self.assertEqual(parse_and_solve_math(text), 42)
+
+    def test_latex_array_sums_all_numbers(self):
+        text = r"\begin{array}{c}{1}\\{2}\\{3}\end{array}"
+        self.assertEqual(parse_and_solve_math(text), 6)
+
+    def test_no_expression(self):
+        self.assertIsNone(parse_and_solve_math(""))
+        self.assertIsNone(parse_and_solve_math("no math here"))
+
+
+if __name__ == "__main__":
+    unittest.main()
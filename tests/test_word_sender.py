@@ -0,0 +1,38 @@
+"""Tests for the word sending loop."""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from levelup_bot.services import word_sender
+
+
+class WordSenderLoopTest(unittest.IsolatedAsyncioTestCase):
+    """word_sender_loop keeps running through failed sends."""
+
+    async def test_value_error_does_not_end_loop(self):
+        shutdown_event = asyncio.Event()
+        calls = []
+
+        async def fake_send(client, group_entity, word):
+            calls.append(word)
+            if len(calls) == 1:
+                raise ValueError("Could not find the input entity")
+            shutdown_event.set()
+            return None
+
+        with mock.patch.object(word_sender, "ENABLE_WORD_SENDING", True), \
+                mock.patch.object(word_sender, "AUTO_DELETE_WORD_MESSAGES", False), \
+                mock.patch.object(word_sender, "send_message_to_group", fake_send), \
+                mock.patch.object(word_sender.asyncio, "sleep", mock.AsyncMock()) as sleep:
+            await asyncio.wait_for(
+                word_sender.word_sender_loop(None, object(), ["word"], shutdown_event),
+                timeout=5
+            )
+
+        self.assertEqual(len(calls), 2)
+        sleep.assert_awaited_once_with(5)
+
+
+if __name__ == "__main__":
+    unittest.main()